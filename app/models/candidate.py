@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 from datetime import datetime
 
@@ -26,6 +26,18 @@ class CandidateUpdate(BaseModel):
     desired_position: Optional[str] = None
     resume_url: Optional[str] = None
     summary: Optional[str] = None
+    status: Optional[str] = None
+    score: Optional[float] = None
+
+class CandidateBulkUpdateItem(BaseModel):
+    id: str
+    changes: CandidateUpdate
+
+class CandidateBulkUpdate(BaseModel):
+    items: List[CandidateBulkUpdateItem] = Field(..., min_length=1, max_length=5000)
+
+class CandidateBatchRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=500)
 
 class Candidate(BaseModel):
     id: str
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -25,4 +25,9 @@ class OutreachMessage(BaseModel):
     subject: Optional[str] = None
     body: Optional[str] = None
     status: str = "pending"
-    sent_at: Optional[datetime] = None 
\ No newline at end of file
+    sent_at: Optional[datetime] = None
+
+class OutreachBulkMessage(BaseModel):
+    template_id: str
+    candidate_ids: List[str] = Field(..., min_length=1, max_length=10000)
+    status: str = "pending"
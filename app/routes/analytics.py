@@ -1,50 +1,104 @@
-from fastapi import APIRouter, Depends
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional
 from app.services.auth import verify_token
-from supabase import create_client, Client
+from app.services.analytics import analytics_aggregator, reconcile_analytics
+from app.services.rollups import get_timeseries, GRANULARITIES, TIMESERIES_MAX_DAYS
+from app.services.snapshot_cache import SnapshotCache
+from app.services.http_cache import make_etag, conditional_json
+from app.services.columnar import get_candidate_snapshot, CandidateSnapshot
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
 
 router = APIRouter()
-supabase: Client = create_client(
-    os.getenv("SUPABASE_URL"),
-    os.getenv("SUPABASE_KEY")
+
+def load_analytics() -> Dict[str, Any]:
+    # Counters are maintained on writes; only load them from the database on first use
+    if not analytics_aggregator.ready:
+        reconcile_analytics()
+    return analytics_aggregator.snapshot()
+
+# Analytics only needs to be fresh to within a minute, so bursts of dashboard loads share one snapshot
+analytics_cache = SnapshotCache(
+    "analytics",
+    load_analytics,
+    soft_ttl=float(os.getenv("ANALYTICS_SOFT_TTL_SECONDS", "60")),
+    hard_ttl=float(os.getenv("ANALYTICS_HARD_TTL_SECONDS", "300"))
 )
 
 @router.get("/")
-async def get_analytics(token: str = Depends(verify_token)) -> Dict[str, Any]:
-    # Get total candidates
-    candidates = supabase.table("candidates").select("id").execute()
-    total_candidates = len(candidates.data)
-    
-    # Get candidates by status
-    status_counts = {}
-    for candidate in candidates.data:
-        status = candidate.get("status", "unknown")
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
-    # Get outreach statistics
-    outreach = supabase.table("outreach_messages").select("*").execute()
-    total_outreach = len(outreach.data)
-    successful_outreach = len([m for m in outreach.data if m.get("status") == "sent"])
-    
-    # Get top skills
-    skills_count = {}
-    for candidate in candidates.data:
-        for skill in candidate.get("skills", []):
-            skills_count[skill] = skills_count.get(skill, 0) + 1
-    
-    top_skills = sorted(skills_count.items(), key=lambda x: x[1], reverse=True)[:5]
-    
+async def get_analytics(request: Request, token: str = Depends(verify_token)):
+    payload = await analytics_cache.get()
+    # Derived from the snapshot itself, so every worker process agrees on the ETag for the same payload
+    return conditional_json(
+        request,
+        make_etag("analytics", payload),
+        lambda: payload,
+        cache_control="private, max-age=30, must-revalidate"
+    )
+
+@router.get("/timeseries")
+async def get_analytics_timeseries(
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    granularity: str = "day",
+    token: str = Depends(verify_token)
+) -> Dict[str, Any]:
+    if granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported granularity. Allowed: {', '.join(GRANULARITIES)}"
+        )
+
+    to_date = to_date or datetime.utcnow().date()
+    from_date = from_date or to_date - timedelta(days=29)
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'"
+        )
+    if (to_date - from_date).days + 1 > TIMESERIES_MAX_DAYS[granularity]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too long. At most {TIMESERIES_MAX_DAYS[granularity]} days at {granularity} granularity"
+        )
+
     return {
-        "total_candidates": total_candidates,
-        "status_distribution": status_counts,
-        "outreach_stats": {
-            "total": total_outreach,
-            "successful": successful_outreach,
-            "success_rate": (successful_outreach / total_outreach * 100) if total_outreach > 0 else 0
-        },
-        "top_skills": dict(top_skills)
-    } 
\ No newline at end of file
+        "from": from_date.isoformat(),
+        "to": to_date.isoformat(),
+        "granularity": granularity,
+        "buckets": get_timeseries(from_date, to_date, granularity)
+    }
+
+def _require_snapshot() -> CandidateSnapshot:
+    snapshot = get_candidate_snapshot()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Candidate snapshot not exported yet"
+        )
+    return snapshot
+
+def _report(snapshot: CandidateSnapshot, report: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "candidates": len(snapshot),
+        "snapshot_exported_at": datetime.utcfromtimestamp(snapshot.exported_at).isoformat(),
+        **report
+    }
+
+@router.get("/reports/experience")
+async def get_experience_report(token: str = Depends(verify_token)) -> Dict[str, Any]:
+    snapshot = _require_snapshot()
+    return _report(snapshot, snapshot.experience_distribution())
+
+@router.get("/reports/score-percentiles")
+async def get_score_percentiles_report(token: str = Depends(verify_token)) -> Dict[str, Any]:
+    snapshot = _require_snapshot()
+    return _report(snapshot, snapshot.score_percentiles())
+
+@router.get("/reports/skill-cooccurrence")
+async def get_skill_cooccurrence_report(
+    top_n: int = Query(15, ge=1, le=62),
+    token: str = Depends(verify_token)
+) -> Dict[str, Any]:
+    snapshot = _require_snapshot()
+    return _report(snapshot, snapshot.skill_cooccurrence(top_n))
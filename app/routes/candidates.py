@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Query
 from typing import List, Optional, Dict, Any
-from app.models.candidate import Candidate, CandidateCreate, CandidateUpdate
-from app.services.candidate import create_candidate
+from app.models.candidate import Candidate, CandidateCreate, CandidateUpdate, CandidateBatchRequest, CandidateBulkUpdate
+from app.services.candidate import create_candidate, get_candidates_by_ids, bulk_update_candidates
+from app.services.cache import candidate_cache
+from app.services.leaderboard import leaderboard
+from app.services.export import stream_export, export_filename, export_media_type, CANDIDATE_EXPORT_COLUMNS
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from app.services.http_cache import make_etag, conditional_json
 from app.services.auth import verify_token
 from app.services.nl_search_parser import parse_nl_search_query, SearchCriteria
 from supabase import create_client, Client
+import asyncio
 import os
 from dotenv import load_dotenv
 import logging
@@ -127,13 +134,48 @@ async def search_candidates(
         }
 
 @router.get("/leaderboard", response_model=List[Candidate])
-async def get_leaderboard(token: str = Depends(verify_token)):
-    result = supabase.table("candidates")\
-        .select("*")\
-        .order("score", desc=True)\
-        .limit(10)\
-        .execute()
-    return result.data
+async def get_leaderboard(
+    request: Request,
+    skill: Optional[str] = None,
+    location: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    token: str = Depends(verify_token)
+):
+    # Served from the in-memory boards; only fall back to the database before the first rebuild
+    if leaderboard.ready:
+        rows = leaderboard.top(limit=limit, skill=skill, location=location)
+    else:
+        query_builder = supabase.table("candidates").select("*")
+        if skill:
+            query_builder = query_builder.contains("skills", [skill])
+        if location:
+            query_builder = query_builder.eq("location", location)
+        rows = query_builder\
+            .order("score", desc=True)\
+            .limit(limit)\
+            .execute().data
+
+    # Derived from what is returned, so every worker process agrees on the ETag
+    etag = make_etag("leaderboard", [(row["id"], row.get("score"), row.get("updated_at")) for row in rows])
+    return conditional_json(
+        request,
+        etag,
+        lambda: jsonable_encoder([Candidate(**row) for row in rows]),
+        cache_control="private, max-age=10, must-revalidate"
+    )
+
+@router.get("/export")
+async def export_candidates(
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    token: str = Depends(verify_token)
+):
+    # Streamed page by page, so memory stays flat regardless of table size
+    return StreamingResponse(
+        stream_export("candidates", CANDIDATE_EXPORT_COLUMNS, format, gzip),
+        media_type=export_media_type(format, gzip),
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("candidates", format, gzip)}"'}
+    )
 
 @router.post("/{candidate_id}/background-check")
 async def run_background_check(
@@ -178,7 +220,7 @@ async def create_candidate_endpoint(
             }
         
         # Create candidate with user ID as creator
-        result = create_candidate(candidate, user_id)
+        result = await create_candidate(candidate, user_id)
         # print("Create candidate result:", result)
         
         if not result["success"]:
@@ -199,9 +241,9 @@ async def create_candidate_endpoint(
             "data": f"Failed to create candidate: {str(e)}"
         }
 
-@router.get("/{candidate_id}", response_model=Dict[str, Any])
-async def get_candidate_details(
-    candidate_id: str,
+@router.post("/batch", response_model=Dict[str, Any])
+async def get_candidates_batch(
+    batch: CandidateBatchRequest,
     request: Request
 ):
     try:
@@ -216,29 +258,114 @@ async def get_candidate_details(
             }
 
         token = authorization.split(" ")[1]
+        payload = await asyncio.to_thread(verify_token, token)
+        if not payload.get("sub"):
+            return {
+                "success": False,
+                "data": "Invalid token: missing user ID"
+            }
 
-        # Optional: Verify token if needed for RLS or user-specific logic
-        # payload = verify_token(token)
-        # user_id = payload.get("sub")
+        # One auth check and a few batched queries for the whole board instead of one per card
+        result = await asyncio.to_thread(get_candidates_by_ids, batch.ids)
+        return {
+            "success": True,
+            "data": result["candidates"],
+            "missing_ids": result["missing_ids"]
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to fetch candidate batch: {str(e)}")
+        return {
+            "success": False,
+            "data": f"Failed to fetch candidates: {str(e)}"
+        }
 
-        # Fetch candidate from Supabase
-        result = supabase.table("candidates")\
-            .select("*")\
-            .eq("id", candidate_id)\
-            .single()\
-            .execute()
+@router.patch("/bulk", response_model=Dict[str, Any])
+async def bulk_update_candidates_endpoint(
+    bulk: CandidateBulkUpdate,
+    request: Request
+):
+    try:
+        # Get authorization header
+        authorization = request.headers.get("Authorization")
+
+        # Extract token from Authorization header
+        if not authorization or not authorization.startswith("Bearer "):
+            return {
+                "success": False,
+                "data": "Invalid authorization header. Expected 'Bearer <token>'"
+            }
 
-        if not result.data:
+        token = authorization.split(" ")[1]
+        payload = await asyncio.to_thread(verify_token, token)
+        if not payload.get("sub"):
             return {
                 "success": False,
-                "data": "Candidate not found"
+                "data": "Invalid token: missing user ID"
             }
 
+        # Identical changes share one filtered update, so moving a whole column is a handful of writes
+        result = await asyncio.to_thread(bulk_update_candidates, bulk.items)
         return {
             "success": True,
-            "data": result.data
+            "data": result
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to bulk update candidates: {str(e)}")
+        return {
+            "success": False,
+            "data": f"Failed to update candidates: {str(e)}"
         }
 
+@router.get("/{candidate_id}", response_model=Dict[str, Any])
+async def get_candidate_details(
+    candidate_id: str,
+    request: Request
+):
+    try:
+        # Get authorization header
+        authorization = request.headers.get("Authorization")
+
+        # Extract token from Authorization header
+        if not authorization or not authorization.startswith("Bearer "):
+            return {
+                "success": False,
+                "data": "Invalid authorization header. Expected 'Bearer <token>'"
+            }
+
+        token = authorization.split(" ")[1]
+
+        # Optional: Verify token if needed for RLS or user-specific logic
+        # payload = verify_token(token)
+        # user_id = payload.get("sub")
+
+        # Served from the shared candidate cache when possible, otherwise fetched from Supabase
+        candidate = candidate_cache.get(candidate_id)
+        if candidate is None:
+            result = supabase.table("candidates")\
+                .select("*")\
+                .eq("id", candidate_id)\
+                .single()\
+                .execute()
+
+            if not result.data:
+                return {
+                    "success": False,
+                    "data": "Candidate not found"
+                }
+            candidate = result.data
+            candidate_cache.set(candidate_id, candidate)
+
+        # updated_at changes on every write, so it validates the cached copy without hashing the row
+        etag = make_etag("candidate", candidate["id"], candidate.get("updated_at"))
+        return conditional_json(
+            request,
+            etag,
+            lambda: {"success": True, "data": candidate},
+            cache_control="private, no-cache"
+        )
+
     except Exception as e:
         # Check for Supabase-specific errors like not found
         if "PGRST" in str(e): # Supabase specific error indicator
@@ -1,8 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from typing import List
-from app.models.outreach import OutreachTemplate, OutreachTemplateCreate, OutreachMessage
+from app.models.outreach import OutreachTemplate, OutreachTemplateCreate, OutreachMessage, OutreachBulkMessage
 from app.services.auth import verify_token
+from app.services.analytics import analytics_aggregator
+from app.services.rollups import record_outreach_status
+from app.services.outreach import fetch_template, fetch_candidate, send_bulk_outreach, prepare_single_message
+from app.services.http_cache import make_etag, etag_matches, not_modified, conditional_json
+from app.services.export import stream_export, export_filename, export_media_type, OUTREACH_EXPORT_COLUMNS
+from app.services.batch_writer import outreach_writer
 from supabase import create_client, Client
+import asyncio
 import os
 from dotenv import load_dotenv
 
@@ -15,43 +24,71 @@ supabase: Client = create_client(
 )
 
 @router.get("/templates", response_model=List[OutreachTemplate])
-async def get_templates(token: str = Depends(verify_token)):
+async def get_templates(request: Request, token: str = Depends(verify_token)):
+    # Validate against the (id, updated_at) list first; only fetch full bodies when it changed
+    versions = supabase.table("outreach_templates").select("id,updated_at").order("id").execute()
+    etag = make_etag("templates", [(row["id"], row.get("updated_at")) for row in versions.data or []])
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control="private, max-age=60")
+
     result = supabase.table("outreach_templates").select("*").execute()
-    return result.data
+    return conditional_json(
+        request,
+        etag,
+        lambda: jsonable_encoder([OutreachTemplate(**row) for row in result.data or []]),
+        cache_control="private, max-age=60"
+    )
+
+@router.get("/export")
+async def export_outreach(
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    token: str = Depends(verify_token)
+):
+    # Streamed page by page, so memory stays flat regardless of table size
+    return StreamingResponse(
+        stream_export("outreach_messages", OUTREACH_EXPORT_COLUMNS, format, gzip),
+        media_type=export_media_type(format, gzip),
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("outreach_messages", format, gzip)}"'}
+    )
 
 @router.post("/send")
 async def send_outreach(
     message: OutreachMessage,
     token: str = Depends(verify_token)
 ):
-    # Get template
-    template = supabase.table("outreach_templates")\
-        .select("*")\
-        .eq("id", message.template_id)\
-        .execute()
-    
-    if not template.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Template not found"
-        )
+    # Template and candidate lookups are independent, so run them concurrently
+    template, candidate = await asyncio.gather(
+        asyncio.to_thread(fetch_template, message.template_id),
+        asyncio.to_thread(fetch_candidate, message.candidate_id)
+    )
     
-    # Get candidate
-    candidate = supabase.table("candidates")\
-        .select("*")\
-        .eq("id", message.candidate_id)\
-        .execute()
+    # Store references plus the rendered text, not copies of the template and candidate rows
+    message_data = prepare_single_message(message.dict(), template, candidate)
     
-    if not candidate.data:
+    row = await outreach_writer.write(message_data)
+    if not row:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to store outreach message"
         )
-    
-    # Create outreach message
-    message_data = message.dict()
-    message_data["template"] = template.data[0]
-    message_data["candidate"] = candidate.data[0]
-    
-    result = supabase.table("outreach_messages").insert(message_data).execute()
-    return result.data[0] 
\ No newline at end of file
+    analytics_aggregator.record_outreach(
+        row.get("status"),
+        candidate_id=message.candidate_id,
+        sender_id=token.get("sub") if isinstance(token, dict) else None
+    )
+    record_outreach_status(row)
+    return row
+
+@router.post("/send-bulk")
+async def send_bulk_outreach_endpoint(
+    bulk: OutreachBulkMessage,
+    token: str = Depends(verify_token)
+):
+    return await asyncio.to_thread(
+        send_bulk_outreach,
+        bulk.template_id,
+        bulk.candidate_ids,
+        bulk.status,
+        token.get("sub") if isinstance(token, dict) else None
+    )
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException, status, UploadFile, File, Request
+from fastapi import APIRouter, HTTPException, status, UploadFile, File, Request, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.services.auth import verify_token
 from app.services.resume_parser import parse_resume
+from app.services.resume_jobs import resume_jobs, public_job
+from app.services.uploads import store_upload
+import asyncio
 import logging
 import os
 from typing import Dict, Any
@@ -14,7 +18,8 @@ router = APIRouter()
 @router.post("/upload")
 async def upload_resume_endpoint(
     request: Request,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    background: bool = Query(False, alias="async")
 ):
     try:
         # Debug logging
@@ -35,8 +40,8 @@ async def upload_resume_endpoint(
         token = authorization.split(" ")[1]
         logger.debug(f"Extracted token: {token[:10]}...")
         
-        # Extract user info from token
-        payload = verify_token(token)
+        # Extract user info from token (a synchronous Supabase call, so off the event loop)
+        payload = await asyncio.to_thread(verify_token, token)
         user_id = payload.get("sub")
         user_role = payload.get("role")
         logger.debug(f"User ID: {user_id}, Role: {user_role}")
@@ -58,20 +63,92 @@ async def upload_resume_endpoint(
                 "data": f"Unsupported file type. Allowed types: {', '.join(allowed_types)}"
             }
         
-        # Read file content
-        file_content = await file.read()
+        # Spool the upload to disk in chunks (size-capped and hashed on the way) instead of reading it into memory
+        if background:
+            # Queue the parse and answer right away; clients poll the job or follow its event stream
+            with await store_upload(file) as upload:
+                job = await resume_jobs.submit(upload, user_id)
+            job_url = f"/api/resumes/jobs/{job['id']}"
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                headers={"Location": job_url},
+                content={
+                    "success": True,
+                    "data": {**public_job(job), "status_url": job_url, "events_url": f"{job_url}/events"}
+                }
+            )
 
-        # Parse resume using Groq-powered parser
-        result = await parse_resume(file_content, file_extension)
+        with await store_upload(file) as upload:
+            # Parse resume using Groq-powered parser
+            result = await parse_resume(upload)
 
         return {
             "success": True,
             "data": result
         }
         
+    except HTTPException:
+        # Oversized (413), empty (400), backpressure (429) and timeouts (504) keep their status codes
+        raise
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         return {
             "success": False,
             "data": f"Failed to process resume: {str(e)}"
-        } 
\ No newline at end of file
+        } 
+
+async def _authorized_user(request: Request):
+    authorization = request.headers.get("Authorization")
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    # verify_token calls Supabase synchronously; keep it off the event loop
+    payload = await asyncio.to_thread(verify_token, authorization.split(" ")[1])
+    return payload.get("sub")
+
+async def _owned_job(job_id: str, user_id: str):
+    job = await resume_jobs.get(job_id)
+    # Other users' jobs are reported as missing rather than forbidden
+    if job is None or job["user_id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume job not found"
+        )
+    return job
+
+@router.get("/jobs/{job_id}")
+async def get_resume_job(job_id: str, request: Request):
+    try:
+        user_id = await _authorized_user(request)
+        if not user_id:
+            return {
+                "success": False,
+                "data": "Invalid authorization header. Expected 'Bearer <token>'"
+            }
+        job = await _owned_job(job_id, user_id)
+        return {
+            "success": True,
+            "data": public_job(job)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch resume job {job_id}: {str(e)}")
+        return {
+            "success": False,
+            "data": f"Failed to fetch resume job: {str(e)}"
+        }
+
+@router.get("/jobs/{job_id}/events")
+async def stream_resume_job(job_id: str, request: Request):
+    user_id = await _authorized_user(request)
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authorization header. Expected 'Bearer <token>'"
+        )
+    await _owned_job(job_id, user_id)
+    return StreamingResponse(
+        resume_jobs.events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
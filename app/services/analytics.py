@@ -0,0 +1,248 @@
+from supabase import create_client, Client
+from collections import Counter
+from typing import Dict, Any, List, Optional
+from app.services.sketches import SpaceSaving, HyperLogLog, save_sketches, load_sketches
+from app.services.export import iter_table_pages
+import glob
+import math
+import os
+import threading
+from dotenv import load_dotenv
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Initialize Supabase client
+supabase: Client = create_client(
+    os.getenv("SUPABASE_URL"),
+    os.getenv("SUPABASE_KEY")
+)
+
+TOP_SKILLS_LIMIT = 5
+ANALYTICS_RECONCILE_SECONDS = int(os.getenv("ANALYTICS_RECONCILE_SECONDS", "300"))
+# Approximate mode bounds analytics memory with sketches instead of exact counters
+ANALYTICS_APPROXIMATE = os.getenv("ANALYTICS_APPROXIMATE", "false").lower() == "true"
+ANALYTICS_SKILL_SKETCH_SIZE = int(os.getenv("ANALYTICS_SKILL_SKETCH_SIZE", "256"))
+ANALYTICS_SKETCH_DIR = os.getenv("ANALYTICS_SKETCH_DIR")
+DISTINCT_COUNTS = ("locations", "contacted_candidates", "recruiters")
+
+def get_candidate_status_counts() -> Dict[str, int]:
+    """Count candidates per status in the database (one row per status)."""
+    result = supabase.rpc("candidate_status_counts", {}).execute()
+    return {row["status"] or "unknown": row["count"] for row in result.data or []}
+
+def get_top_skills(limit: Optional[int] = TOP_SKILLS_LIMIT) -> Dict[str, int]:
+    """Return the most common candidate skills, counted in the database (all of them if limit is None)."""
+    result = supabase.rpc("top_candidate_skills", {"n": limit}).execute()
+    return {row["skill"]: row["count"] for row in result.data or []}
+
+def get_outreach_status_counts() -> Dict[str, int]:
+    """Count outreach messages per status in the database."""
+    result = supabase.rpc("outreach_status_counts", {}).execute()
+    return {row["status"] or "unknown": row["count"] for row in result.data or []}
+
+def get_distinct_sketches() -> Dict[str, HyperLogLog]:
+    """HyperLogLog sketches of the distinct values already in the database, read page by page.
+
+    Recruiters are not stored on outreach rows, so that sketch only ever holds what
+    this and sibling workers observed.
+    """
+    sketches = {name: HyperLogLog() for name in DISTINCT_COUNTS}
+    for page in iter_table_pages("candidates", "id,location"):
+        for row in page:
+            if row.get("location"):
+                sketches["locations"].add(row["location"].strip().lower())
+    for page in iter_table_pages("outreach_messages", "id,candidate_id"):
+        for row in page:
+            if row.get("candidate_id"):
+                sketches["contacted_candidates"].add(row["candidate_id"])
+    return sketches
+
+def build_analytics(status_counts: Dict[str, int], outreach_counts: Dict[str, int], top_skills: Dict[str, int]) -> Dict[str, Any]:
+    """Assemble the analytics response from grouped counts."""
+    total_outreach = sum(outreach_counts.values())
+    successful_outreach = outreach_counts.get("sent", 0)
+    return {
+        "total_candidates": sum(status_counts.values()),
+        "status_distribution": status_counts,
+        "outreach_stats": {
+            "total": total_outreach,
+            "successful": successful_outreach,
+            "success_rate": (successful_outreach / total_outreach * 100) if total_outreach > 0 else 0
+        },
+        "top_skills": top_skills
+    }
+
+def compute_analytics() -> Dict[str, Any]:
+    """Compute analytics with all aggregation done server-side."""
+    return build_analytics(
+        get_candidate_status_counts(),
+        get_outreach_status_counts(),
+        get_top_skills()
+    )
+
+def _decrement(counter: Counter, key: str):
+    # Drop keys that reach zero so they do not show up in distributions
+    if counter[key] <= 1:
+        counter.pop(key, None)
+    else:
+        counter[key] -= 1
+
+class AnalyticsAggregator:
+    """Running analytics counters, updated by the candidate and outreach write paths.
+
+    Reads serialize the current counters; a periodic reconcile against the database
+    replaces them wholesale to correct any drift (writes from other workers, direct
+    database edits, failed hooks).
+
+    In approximate mode skill frequencies live in a Space-Saving sketch and distinct
+    locations, contacted candidates and recruiters in HyperLogLog sketches, so memory
+    stays bounded however large the vocabulary grows (see app/services/sketches.py
+    for the error bounds).
+    """
+
+    def __init__(self, approximate: bool = False):
+        self._lock = threading.Lock()
+        self.approximate = approximate
+        self.status_counts: Counter = Counter()
+        self.skill_counts = self._new_skill_counts()
+        self.distinct = {name: HyperLogLog() for name in DISTINCT_COUNTS} if approximate else {}
+        self.outreach_counts: Counter = Counter()
+        self.ready = False
+        self.version = 0
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+    def _new_skill_counts(self):
+        return SpaceSaving(ANALYTICS_SKILL_SKETCH_SIZE) if self.approximate else Counter()
+
+    def _changed(self):
+        self.version += 1
+        self._snapshot = None
+
+    def record_candidate(self, row: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """Apply a candidate insert, or an update when the previous row is known."""
+        with self._lock:
+            if previous is not None:
+                _decrement(self.status_counts, previous.get("status") or "unknown")
+                for skill in set(previous.get("skills") or []):
+                    if self.approximate:
+                        self.skill_counts.discard(skill)
+                    else:
+                        _decrement(self.skill_counts, skill)
+            self.status_counts[row.get("status") or "unknown"] += 1
+            for skill in set(row.get("skills") or []):
+                if self.approximate:
+                    self.skill_counts.add(skill)
+                else:
+                    self.skill_counts[skill] += 1
+            if self.approximate and row.get("location"):
+                self.distinct["locations"].add(row["location"].strip().lower())
+            self._changed()
+
+    def record_outreach(
+        self,
+        status: Optional[str],
+        previous_status: Optional[str] = None,
+        candidate_id: Optional[str] = None,
+        sender_id: Optional[str] = None
+    ):
+        """Apply a new outreach message, or a status transition of an existing one."""
+        with self._lock:
+            if previous_status is not None:
+                _decrement(self.outreach_counts, previous_status)
+            self.outreach_counts[status or "unknown"] += 1
+            if self.approximate:
+                if candidate_id:
+                    self.distinct["contacted_candidates"].add(candidate_id)
+                if sender_id:
+                    self.distinct["recruiters"].add(sender_id)
+            self._changed()
+
+    def reconcile(
+        self,
+        status_counts: Dict[str, int],
+        skill_counts: Dict[str, int],
+        outreach_counts: Dict[str, int],
+        distinct: Optional[Dict[str, HyperLogLog]] = None
+    ):
+        """Replace all counters with authoritative database counts.
+
+        `skill_counts` should be the full aggregate so the sketch's total (and with it
+        the error bound) is right. Distinct-count sketches are unions, so database
+        sketches are merged into the live ones rather than replacing them.
+        """
+        with self._lock:
+            self.status_counts = Counter(status_counts)
+            if self.approximate:
+                self.skill_counts = SpaceSaving.from_counts(skill_counts, ANALYTICS_SKILL_SKETCH_SIZE)
+            else:
+                self.skill_counts = Counter(skill_counts)
+            self.outreach_counts = Counter(outreach_counts)
+            for name, hll in (distinct or {}).items():
+                if name in self.distinct:
+                    self.distinct[name] = self.distinct[name].merge(hll)
+            self.ready = True
+            self._changed()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serialize the current counters; cached until the next write."""
+        with self._lock:
+            if self._snapshot is None:
+                if self.approximate:
+                    top_skills = dict(self.skill_counts.top(TOP_SKILLS_LIMIT))
+                else:
+                    top_skills = dict(self.skill_counts.most_common(TOP_SKILLS_LIMIT))
+                self._snapshot = build_analytics(
+                    dict(self.status_counts),
+                    dict(self.outreach_counts),
+                    top_skills
+                )
+                if self.approximate:
+                    self._snapshot["approximate"] = True
+                    self._snapshot["distinct_counts"] = {name: hll.count() for name, hll in self.distinct.items()}
+                    self._snapshot["error_bounds"] = {
+                        "top_skills_max_overcount": self.skill_counts.total // self.skill_counts.capacity,
+                        "distinct_counts_relative_error": round(1.04 / math.sqrt(len(self.distinct["locations"].registers)), 4)
+                    }
+            return self._snapshot
+
+    def sync_sketches(self, directory: str):
+        """Persist this worker's distinct-count sketches and fold in those of its siblings.
+
+        HyperLogLog merges are idempotent, so re-reading a sibling's file (or our own)
+        never double counts.
+        """
+        if not self.approximate:
+            return
+        with self._lock:
+            for path in glob.glob(os.path.join(directory, "analytics-*.json")):
+                try:
+                    sibling = load_sketches(path)
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Skipping unreadable sketch file {path}: {str(e)}")
+                    continue
+                for name, hll in sibling.items():
+                    if name in self.distinct:
+                        self.distinct[name] = self.distinct[name].merge(hll)
+            save_sketches(os.path.join(directory, f"analytics-{os.getpid()}.json"), self.distinct)
+            self._changed()
+
+# Shared per-process counters
+analytics_aggregator = AnalyticsAggregator(approximate=ANALYTICS_APPROXIMATE)
+
+def reconcile_analytics():
+    """Reload the analytics counters from server-side aggregates."""
+    analytics_aggregator.reconcile(
+        get_candidate_status_counts(),
+        # Every skill: the sketch keeps only the heaviest, but its total must cover them all
+        get_top_skills(limit=None),
+        get_outreach_status_counts(),
+        get_distinct_sketches() if ANALYTICS_APPROXIMATE else None
+    )
+    if ANALYTICS_SKETCH_DIR:
+        analytics_aggregator.sync_sketches(ANALYTICS_SKETCH_DIR)
+    logger.debug("Analytics counters reconciled with the database")
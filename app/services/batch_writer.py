@@ -0,0 +1,143 @@
+from supabase import create_client, Client
+from typing import Dict, Any, List, Optional, Tuple
+from app.services.metrics import metrics
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Initialize Supabase client
+supabase: Client = create_client(
+    os.getenv("SUPABASE_URL"),
+    os.getenv("SUPABASE_KEY")
+)
+
+# 0 disables group commit: every write goes straight to the database
+WRITE_BATCH_WINDOW_MS = float(os.getenv("WRITE_BATCH_WINDOW_MS", "0"))
+WRITE_BATCH_MAX_ROWS = int(os.getenv("WRITE_BATCH_MAX_ROWS", "100"))
+
+FLUSH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+Pending = Tuple[Dict[str, Any], asyncio.Future, float]
+
+class GroupCommitWriter:
+    """Collects concurrent single-row writes and flushes them as one bulk statement.
+
+    A flush happens `window_ms` after the first queued row or as soon as `max_rows`
+    are queued, whichever comes first. Each caller's future resolves with its own
+    returned row, or with its own error: if a bulk statement fails, its rows are
+    retried one by one so a single bad row cannot fail its neighbours.
+    """
+
+    def __init__(self, table: str, on_conflict: Optional[str] = None, window_ms: float = WRITE_BATCH_WINDOW_MS, max_rows: int = WRITE_BATCH_MAX_ROWS):
+        self.table = table
+        self.on_conflict = on_conflict
+        self.window_ms = window_ms
+        self.max_rows = max_rows
+        self._queue: List[Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks, so in-flight flushes are held here
+        self._flushes: set = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_ms > 0
+
+    async def write(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Write one row, going through the group commit only when it is enabled."""
+        if self.enabled:
+            return await self.submit(row)
+        returned = await asyncio.to_thread(self._write, [row])
+        return returned[0] if returned else None
+
+    async def submit(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((row, future, time.perf_counter()))
+        if len(self._queue) >= self.max_rows:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._schedule_flush)
+        return await future
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queue = self._queue, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    def _write(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        query = supabase.table(self.table)
+        if self.on_conflict:
+            result = query.upsert(rows, on_conflict=self.on_conflict).execute()
+        else:
+            result = query.insert(rows).execute()
+        return result.data or []
+
+    def _rounds(self, batch: List[Pending]) -> List[List[Pending]]:
+        # An upsert may not touch the same conflict key twice, so repeats go to later rounds
+        if not self.on_conflict:
+            return [batch]
+        rounds: List[List[Pending]] = []
+        seen: List[set] = []
+        for pending in batch:
+            key = pending[0].get(self.on_conflict)
+            for index, keys in enumerate(seen):
+                if key not in keys:
+                    keys.add(key)
+                    rounds[index].append(pending)
+                    break
+            else:
+                seen.append({key})
+                rounds.append([pending])
+        return rounds
+
+    def _resolve(self, batch: List[Pending], returned: List[Dict[str, Any]]):
+        if self.on_conflict:
+            by_key = {row.get(self.on_conflict): row for row in returned}
+            results = [by_key.get(row.get(self.on_conflict)) for row, _, _ in batch]
+        else:
+            # PostgREST returns inserted rows in request order
+            results = returned if len(returned) == len(batch) else [None] * len(batch)
+        now = time.perf_counter()
+        for (_, future, queued_at), result in zip(batch, results):
+            if future.done():
+                continue
+            if result is None:
+                future.set_exception(RuntimeError(f"No row returned for {self.table} write"))
+            else:
+                future.set_result(result)
+            metrics.observe(f"batch_writer.{self.table}.wait_seconds", now - queued_at)
+
+    async def _flush(self, batch: List[Pending]):
+        for round_batch in self._rounds(batch):
+            started = time.perf_counter()
+            try:
+                returned = await asyncio.to_thread(self._write, [row for row, _, _ in round_batch])
+                self._resolve(round_batch, returned)
+            except Exception as e:
+                logger.warning(f"Bulk write of {len(round_batch)} rows to {self.table} failed, retrying row by row: {str(e)}")
+                for pending in round_batch:
+                    try:
+                        returned = await asyncio.to_thread(self._write, [pending[0]])
+                        self._resolve([pending], returned)
+                    except Exception as row_error:
+                        if not pending[1].done():
+                            pending[1].set_exception(row_error)
+            metrics.observe(f"batch_writer.{self.table}.flush_size", len(round_batch), FLUSH_SIZE_BUCKETS)
+            metrics.observe(f"batch_writer.{self.table}.flush_seconds", time.perf_counter() - started)
+
+# Shared writers for the hot single-row write paths
+candidate_writer = GroupCommitWriter("candidates", on_conflict="email")
+outreach_writer = GroupCommitWriter("outreach_messages")
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from app.services.metrics import metrics
+import os
+import threading
+import time
+
+CANDIDATE_CACHE_SIZE = int(os.getenv("CANDIDATE_CACHE_SIZE", "5000"))
+CANDIDATE_CACHE_TTL_SECONDS = float(os.getenv("CANDIDATE_CACHE_TTL_SECONDS", "30"))
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire `ttl` seconds after being stored."""
+
+    def __init__(self, name: str, max_size: int, ttl: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Any, now: float) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key: Any) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        """Return the cached values for `keys`; misses are simply absent."""
+        now = time.monotonic()
+        found = {}
+        requested = 0
+        with self._lock:
+            for key in keys:
+                requested += 1
+                value = self._lookup(key, now)
+                if value is not None:
+                    found[key] = value
+        metrics.increment(f"{self.name}.hits", len(found))
+        metrics.increment(f"{self.name}.misses", requested - len(found))
+        return found
+
+    def set(self, key: Any, value: Any):
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[Any, Any]]):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[Any]):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Candidate rows by id, shared by the detail and batch read endpoints
+candidate_cache = TTLCache("candidate_cache", CANDIDATE_CACHE_SIZE, CANDIDATE_CACHE_TTL_SECONDS)
@@ -1,44 +1,139 @@
 from fastapi import HTTPException
-from app.models.candidate import CandidateCreate
+from datetime import datetime, timezone
+from app.models.candidate import CandidateCreate, CandidateBulkUpdateItem
+from app.services.leaderboard import leaderboard
+from app.services.analytics import analytics_aggregator
+from app.services.rollups import record_candidate_created, record_candidate_updated
+from app.services.batch_writer import candidate_writer
+from app.services.cache import candidate_cache
+from typing import Dict, Any, List
+import json
 from supabase import create_client, Client
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Candidate ids per in_() filter, for fetches and bulk updates (keeps the request URL well under proxy limits)
+BULK_UPDATE_CHUNK = 200
+
 # Initialize Supabase client
 supabase: Client = create_client(
     os.getenv("SUPABASE_URL"),
     os.getenv("SUPABASE_KEY")
 )
 
-def create_candidate(candidate_data: CandidateCreate, user_id: str) -> dict:
+async def create_candidate(candidate_data: CandidateCreate, user_id: str) -> dict:
     """Create a new candidate record."""
     try:
         # Convert candidate data to dict
         candidate_dict = candidate_data.dict()
         
+        # Bump updated_at on every write; it backs the candidate ETags
+        candidate_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+        
         # Add created_by field
         # candidate_dict["created_by"] = user_id
         
-        # Insert into candidates table
-        result = supabase.table("candidates")\
-            .upsert(candidate_dict, on_conflict=["email"])\
-            .execute()
+        # Upsert into candidates table (group-committed with concurrent writes when enabled)
+        row = await candidate_writer.write(candidate_dict)
             
-        if not result.data:
+        if not row:
             return {
                 "success": False,
                 "error": "Failed to create candidate"
             }
+
+        # Keep the in-memory leaderboards and analytics counters in step with the write
+        previous = leaderboard.upsert(row)
+        analytics_aggregator.record_candidate(row, previous)
+        if previous is None:
+            record_candidate_created(row)
+        else:
+            record_candidate_updated(row, previous)
+        candidate_cache.set(row["id"], row)
             
         return {
             "success": True,
-            "data": result.data[0]
+            "data": row
         }
         
     except Exception as e:
         return {
             "success": False,
             "error": f"Error creating candidate: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+def fetch_candidates(candidate_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch many candidates with one in_() query per batch, keyed by id."""
+    candidates = {}
+    for start in range(0, len(candidate_ids), BULK_UPDATE_CHUNK):
+        batch = candidate_ids[start:start + BULK_UPDATE_CHUNK]
+        result = supabase.table("candidates")\
+            .select("*")\
+            .in_("id", batch)\
+            .execute()
+        for row in result.data or []:
+            candidates[row["id"]] = row
+    return candidates
+
+def get_candidates_by_ids(candidate_ids: List[str]) -> dict:
+    """Fetch candidates by id in request order: cached rows first, then batched in_() queries for the rest."""
+    # Preserve request order and drop duplicate ids
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    found = candidate_cache.get_many(candidate_ids)
+
+    misses = [candidate_id for candidate_id in candidate_ids if candidate_id not in found]
+    if misses:
+        fetched = fetch_candidates(misses)
+        candidate_cache.set_many(fetched.items())
+        found.update(fetched)
+
+    return {
+        "candidates": [found[candidate_id] for candidate_id in candidate_ids if candidate_id in found],
+        "missing_ids": [candidate_id for candidate_id in candidate_ids if candidate_id not in found]
+    }
+
+def bulk_update_candidates(items: List[CandidateBulkUpdateItem]) -> dict:
+    """Apply partial updates to many candidates with one filtered update per distinct change set."""
+    # Later items for the same id win, field by field
+    changes_by_id: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        changes_by_id.setdefault(item.id, {}).update(item.changes.dict(exclude_unset=True))
+
+    groups: Dict[str, List[str]] = {}
+    skipped_ids = []
+    for candidate_id, changes in changes_by_id.items():
+        if changes:
+            groups.setdefault(json.dumps(changes, sort_keys=True, default=str), []).append(candidate_id)
+        else:
+            # Nothing updatable was sent for this id (no fields, or only ones CandidateUpdate ignores)
+            skipped_ids.append(candidate_id)
+
+    updated_at = datetime.now(timezone.utc).isoformat()
+    rows = []
+    for key, ids in groups.items():
+        changes = {**json.loads(key), "updated_at": updated_at}
+        for start in range(0, len(ids), BULK_UPDATE_CHUNK):
+            result = supabase.table("candidates")\
+                .update(changes)\
+                .in_("id", ids[start:start + BULK_UPDATE_CHUNK])\
+                .execute()
+            rows.extend(result.data or [])
+
+    # One pass over the returned rows keeps the cache, leaderboards, counters and rollups in step
+    candidate_cache.invalidate(changes_by_id.keys())
+    for row in rows:
+        previous = leaderboard.upsert(row)
+        # Without the previous row the counters cannot be adjusted; the periodic reconcile fixes them
+        if previous is not None:
+            analytics_aggregator.record_candidate(row, previous)
+            record_candidate_updated(row, previous)
+
+    updated_ids = {row["id"] for row in rows}
+    requested_ids = [candidate_id for ids in groups.values() for candidate_id in ids]
+    return {
+        "updated": len(rows),
+        "missing_ids": [candidate_id for candidate_id in requested_ids if candidate_id not in updated_ids],
+        "skipped_ids": skipped_ids
+    }
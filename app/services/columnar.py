@@ -0,0 +1,190 @@
+from typing import Dict, Any, List, Optional
+from app.services.export import iter_table_pages
+import numpy as np
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dotenv import load_dotenv
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+CANDIDATE_SNAPSHOT_DIR = os.getenv("CANDIDATE_SNAPSHOT_DIR", "data/candidate_snapshot")
+SNAPSHOT_COLUMNS = "id,experience_years,score,location,status,skills"
+KEEP_SNAPSHOTS = 3
+
+EXPERIENCE_BINS = [0, 1, 2, 3, 5, 8, 10, 15, 20, 30, 100]
+SCORE_PERCENTILES = [10, 25, 50, 75, 90, 95, 99]
+
+class _Dictionary:
+    """Assigns dense integer codes to distinct string values, in first-seen order."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+def export_candidate_snapshot(root: str = CANDIDATE_SNAPSHOT_DIR) -> str:
+    """Export the candidates table into a new columnar snapshot and make it current.
+
+    Layout of a snapshot directory:
+    - experience_years.npy, score.npy: float32, NaN where missing
+    - location.npy, status.npy: int32 dictionary codes, -1 where missing
+    - skills_indptr.npy (int64), skills_indices.npy (int32): CSR rows of skill codes
+    - dictionaries.json: code -> value lists for location, status and skills
+    """
+    started = time.perf_counter()
+    experience, score, location_codes, status_codes = [], [], [], []
+    indptr, indices = [0], []
+    locations, statuses, skills = _Dictionary(), _Dictionary(), _Dictionary()
+
+    for page in iter_table_pages("candidates", SNAPSHOT_COLUMNS):
+        for row in page:
+            experience.append(np.nan if row.get("experience_years") is None else row["experience_years"])
+            score.append(np.nan if row.get("score") is None else row["score"])
+            location_codes.append(locations.encode(row.get("location")))
+            status_codes.append(statuses.encode(row.get("status")))
+            indices.extend(sorted({skills.encode(skill) for skill in row.get("skills") or []}))
+            indptr.append(len(indices))
+
+    os.makedirs(root, exist_ok=True)
+    directory = tempfile.mkdtemp(prefix=f"snapshot-{int(time.time())}-", dir=root)
+    np.save(os.path.join(directory, "experience_years.npy"), np.asarray(experience, dtype=np.float32))
+    np.save(os.path.join(directory, "score.npy"), np.asarray(score, dtype=np.float32))
+    np.save(os.path.join(directory, "location.npy"), np.asarray(location_codes, dtype=np.int32))
+    np.save(os.path.join(directory, "status.npy"), np.asarray(status_codes, dtype=np.int32))
+    np.save(os.path.join(directory, "skills_indptr.npy"), np.asarray(indptr, dtype=np.int64))
+    np.save(os.path.join(directory, "skills_indices.npy"), np.asarray(indices, dtype=np.int32))
+    with open(os.path.join(directory, "dictionaries.json"), "w") as f:
+        json.dump({
+            "location": locations.values,
+            "status": statuses.values,
+            "skills": skills.values,
+            "exported_at": time.time()
+        }, f)
+
+    # Swap atomically: readers follow CURRENT, which is replaced in a single rename
+    pointer = os.path.join(root, "CURRENT")
+    with tempfile.NamedTemporaryFile("w", dir=root, delete=False) as f:
+        f.write(os.path.basename(directory))
+    os.replace(f.name, pointer)
+
+    # Old snapshots may still be mapped by workers; unlinking them is safe on POSIX
+    snapshots = sorted(
+        (d for d in os.listdir(root) if d.startswith("snapshot-")),
+        key=lambda d: os.path.getmtime(os.path.join(root, d))
+    )
+    for stale in snapshots[:-KEEP_SNAPSHOTS]:
+        shutil.rmtree(os.path.join(root, stale), ignore_errors=True)
+
+    logger.info(f"Exported {len(experience)} candidates to {directory} in {time.perf_counter() - started:.2f}s")
+    return directory
+
+class CandidateSnapshot:
+    """Read-only, memory-mapped view of one exported candidate snapshot."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        load = lambda name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        self.experience_years = load("experience_years")
+        self.score = load("score")
+        self.location = load("location")
+        self.status = load("status")
+        self.skills_indptr = load("skills_indptr")
+        self.skills_indices = load("skills_indices")
+        with open(os.path.join(directory, "dictionaries.json")) as f:
+            dictionaries = json.load(f)
+        self.locations: List[str] = dictionaries["location"]
+        self.statuses: List[str] = dictionaries["status"]
+        self.skills: List[str] = dictionaries["skills"]
+        self.exported_at: float = dictionaries["exported_at"]
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    def experience_distribution(self, bins: List[float] = EXPERIENCE_BINS) -> Dict[str, Any]:
+        years = np.asarray(self.experience_years)
+        known = years[~np.isnan(years)]
+        # np.histogram drops values outside the bins; count them in the first or last bucket instead
+        counts, edges = np.histogram(np.clip(known, bins[0], bins[-1]), bins=bins)
+        return {
+            "buckets": [
+                {"min": int(low), "max": int(high), "count": int(count)}
+                for low, high, count in zip(edges[:-1], edges[1:], counts)
+            ],
+            "unknown": int(len(years) - len(known)),
+            "mean": float(known.mean()) if len(known) else None
+        }
+
+    def score_percentiles(self, percentiles: List[float] = SCORE_PERCENTILES) -> Dict[str, Any]:
+        scores = np.asarray(self.score)
+        known = scores[~np.isnan(scores)]
+        values = np.percentile(known, percentiles) if len(known) else [None] * len(percentiles)
+        return {
+            "scored": int(len(known)),
+            "percentiles": {f"p{p:g}": (float(v) if v is not None else None) for p, v in zip(percentiles, values)}
+        }
+
+    def skill_cooccurrence(self, top_n: int = 15) -> Dict[str, Any]:
+        """Pairwise candidate counts for the top_n (at most 62) most common skills."""
+        top_n = min(top_n, 62)
+        indices = np.asarray(self.skills_indices)
+        frequency = np.bincount(indices, minlength=len(self.skills))
+        top = np.argsort(frequency, kind="stable")[::-1][:top_n]
+        top = top[frequency[top] > 0]
+
+        # Map skill codes to bit positions in the top list (-1 for everything else)
+        position = np.full(len(self.skills), -1, dtype=np.int64)
+        position[top] = np.arange(len(top))
+        rows = np.repeat(np.arange(len(self)), np.diff(np.asarray(self.skills_indptr)))
+        keep = position[indices] >= 0
+
+        # One bitmask per candidate; distinct masks are far fewer than candidates
+        masks = np.zeros(len(self), dtype=np.int64)
+        np.bitwise_or.at(masks, rows[keep], np.left_shift(1, position[indices[keep]]))
+        unique_masks, counts = np.unique(masks, return_counts=True)
+        bits = ((unique_masks[:, None] >> np.arange(len(top))) & 1).astype(np.int64)
+        matrix = bits.T @ (bits * counts[:, None])
+
+        return {
+            "skills": [self.skills[code] for code in top],
+            "matrix": matrix.tolist()
+        }
+
+_current: Optional[CandidateSnapshot] = None
+_current_lock = threading.Lock()
+
+def get_candidate_snapshot(root: str = CANDIDATE_SNAPSHOT_DIR) -> Optional[CandidateSnapshot]:
+    """Return the current snapshot, remapping it when an export has swapped CURRENT."""
+    global _current
+    try:
+        with open(os.path.join(root, "CURRENT")) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    directory = os.path.join(root, name)
+    with _current_lock:
+        if _current is None or _current.directory != directory:
+            _current = CandidateSnapshot(directory)
+            logger.debug(f"Mapped candidate snapshot {directory} ({len(_current)} rows)")
+        return _current
+
+if __name__ == "__main__":
+    # Periodic export, e.g. from cron: python -m app.services.columnar [directory]
+    export_candidate_snapshot(sys.argv[1] if len(sys.argv) > 1 else CANDIDATE_SNAPSHOT_DIR)
@@ -0,0 +1,338 @@
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from supabase import create_client, Client
+from typing import Dict, Any, List, Optional, Tuple
+from app.services.analytics import analytics_aggregator
+from app.services.metrics import metrics
+from app.services.rollups import record_outreach_status
+import asyncio
+import heapq
+import os
+import smtplib
+import threading
+import time
+from dotenv import load_dotenv
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Initialize Supabase client
+supabase: Client = create_client(
+    os.getenv("SUPABASE_URL"),
+    os.getenv("SUPABASE_KEY")
+)
+
+OUTREACH_DELIVERY_ENABLED = os.getenv("OUTREACH_DELIVERY_ENABLED", "false").lower() == "true"
+DELIVERY_BATCH_SIZE = int(os.getenv("DELIVERY_BATCH_SIZE", "50"))
+DELIVERY_POLL_SECONDS = float(os.getenv("DELIVERY_POLL_SECONDS", "5"))
+DELIVERY_RATE_PER_SECOND = float(os.getenv("DELIVERY_RATE_PER_SECOND", "10"))
+DELIVERY_BURST = int(os.getenv("DELIVERY_BURST", "20"))
+DELIVERY_MAX_ATTEMPTS = int(os.getenv("DELIVERY_MAX_ATTEMPTS", "5"))
+DELIVERY_BACKOFF_SECONDS = float(os.getenv("DELIVERY_BACKOFF_SECONDS", "2"))
+DELIVERY_MAX_BACKOFF_SECONDS = float(os.getenv("DELIVERY_MAX_BACKOFF_SECONDS", "300"))
+# A claimed ("sending") message whose claim is older than this is handed back to the queue;
+# keep it above DELIVERY_MAX_BACKOFF_SECONDS since a claim is renewed when a retry is scheduled
+DELIVERY_LEASE_SECONDS = float(os.getenv("DELIVERY_LEASE_SECONDS", "600"))
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1):
+        while True:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+class SMTPProvider:
+    """Sends mail over one persistent SMTP connection, reconnecting when it drops."""
+
+    name = "smtp"
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        sender: Optional[str] = None,
+        use_tls: Optional[bool] = None,
+        timeout: float = 30
+    ):
+        self.host = host or os.getenv("SMTP_HOST", "localhost")
+        self.port = port or int(os.getenv("SMTP_PORT", "25"))
+        self.username = username or os.getenv("SMTP_USERNAME")
+        self.password = password or os.getenv("SMTP_PASSWORD")
+        self.sender = sender or os.getenv("SMTP_FROM", "no-reply@localhost")
+        self.use_tls = use_tls if use_tls is not None else os.getenv("SMTP_USE_TLS", "false").lower() == "true"
+        self.timeout = timeout
+        self._connection: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password)
+        return connection
+
+    def send(self, to: str, subject: Optional[str], body: Optional[str]):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = to
+        message["Subject"] = subject or ""
+        message.set_content(body or "")
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            try:
+                self._connection.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                # Pooled connection went stale; retry once on a fresh one
+                self._connection = self._connect()
+                self._connection.send_message(message)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.quit()
+                except smtplib.SMTPException:
+                    pass
+                self._connection = None
+
+class DeliveryWorker:
+    """Background worker that delivers pending outreach messages.
+
+    Each cycle claims up to `batch_size` pending messages (pending -> sending), sends
+    them through the provider under its token-bucket rate limit, and records outcomes
+    with one bulk update per status. Failed sends are retried with exponential
+    backoff and marked failed after `max_attempts`.
+
+    Claims are leases: each carries `claimed_at`, and messages left in "sending"
+    past `lease_seconds` (a crashed worker, lost retry state) are swept back to
+    pending. Outcomes and lease renewals only touch rows still in "sending" with the
+    claimed_at this worker set, so a message that was swept and claimed elsewhere is
+    never overwritten. `stop()` hands back everything this worker still holds.
+    """
+
+    def __init__(self, provider=None, batch_size: int = DELIVERY_BATCH_SIZE, max_attempts: int = DELIVERY_MAX_ATTEMPTS, lease_seconds: float = DELIVERY_LEASE_SECONDS):
+        self.provider = provider or SMTPProvider()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.buckets: Dict[str, TokenBucket] = {
+            self.provider.name: TokenBucket(DELIVERY_RATE_PER_SECOND, DELIVERY_BURST)
+        }
+        self._retries: List[Tuple[float, int, str, Dict[str, Any]]] = []
+        # claimed_at of every message this worker holds whose outcome is not yet recorded
+        self._claims: Dict[str, str] = {}
+        self._last_reclaim = float("-inf")
+        self._task: Optional[asyncio.Task] = None
+
+    def _claim_batch(self, limit: int) -> List[Dict[str, Any]]:
+        pending = supabase.table("outreach_messages")\
+            .select("id")\
+            .eq("status", "pending")\
+            .order("created_at")\
+            .limit(limit)\
+            .execute()
+        ids = [row["id"] for row in pending.data or []]
+        if not ids:
+            return []
+        # Only rows still pending are claimed, so concurrent claimers never share a message
+        claimed = supabase.table("outreach_messages")\
+            .update({"status": "sending", "claimed_at": datetime.now(timezone.utc).isoformat()})\
+            .in_("id", ids)\
+            .eq("status", "pending")\
+            .execute()
+        messages = claimed.data or []
+
+        candidate_ids = list({message["candidate_id"] for message in messages})
+        if candidate_ids:
+            candidates = supabase.table("candidates")\
+                .select("id,email")\
+                .in_("id", candidate_ids)\
+                .execute()
+            emails = {row["id"]: row.get("email") for row in candidates.data or []}
+            for message in messages:
+                message["to"] = emails.get(message["candidate_id"])
+        return messages
+
+    def _update_claimed(self, ids: List[str], update: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Apply update to the given messages this worker still holds; returns the rows changed."""
+        by_claim: Dict[str, List[str]] = {}
+        for message_id in ids:
+            if message_id in self._claims:
+                by_claim.setdefault(self._claims[message_id], []).append(message_id)
+        rows = []
+        for claimed_at, claim_ids in by_claim.items():
+            result = supabase.table("outreach_messages")\
+                .update(update)\
+                .in_("id", claim_ids)\
+                .eq("status", "sending")\
+                .eq("claimed_at", claimed_at)\
+                .execute()
+            rows.extend(result.data or [])
+        lost = len(ids) - len(rows)
+        if lost:
+            logger.warning(f"{lost} outreach messages were reclaimed before this worker updated them")
+            metrics.increment("delivery.lost_claims", lost)
+        return rows
+
+    def _mark(self, ids: List[str], new_status: str) -> List[str]:
+        """Record an outcome for messages this worker still holds; returns the ids updated."""
+        if not ids:
+            return []
+        update = {"status": new_status}
+        if new_status == "sent":
+            update["sent_at"] = datetime.now(timezone.utc).isoformat()
+        if new_status == "pending":
+            update["claimed_at"] = None
+        return [row["id"] for row in self._update_claimed(ids, update)]
+
+    def _renew_lease(self, ids: List[str]) -> List[str]:
+        """Restart the lease on messages this worker still holds; returns the ids renewed."""
+        if not ids:
+            return []
+        rows = self._update_claimed(ids, {"claimed_at": datetime.now(timezone.utc).isoformat()})
+        self._claims.update((row["id"], row["claimed_at"]) for row in rows)
+        return [row["id"] for row in rows]
+
+    def _reclaim_expired(self) -> int:
+        """Return messages whose claim expired (or predates claimed_at) to pending."""
+        expired_before = datetime.fromtimestamp(time.time() - self.lease_seconds, timezone.utc).isoformat()
+        reclaimed = supabase.table("outreach_messages")\
+            .update({"status": "pending", "claimed_at": None})\
+            .eq("status", "sending")\
+            .or_(f"claimed_at.is.null,claimed_at.lt.{expired_before}")\
+            .execute()
+        return len(reclaimed.data or [])
+
+    def _queue_depth(self) -> int:
+        result = supabase.table("outreach_messages")\
+            .select("id", count="exact")\
+            .eq("status", "pending")\
+            .limit(1)\
+            .execute()
+        return result.count or 0
+
+    def _due_retries(self) -> List[Tuple[int, Dict[str, Any]]]:
+        now = time.monotonic()
+        due = []
+        while self._retries and self._retries[0][0] <= now and len(due) < self.batch_size:
+            _, attempt, _, message = heapq.heappop(self._retries)
+            due.append((attempt, message))
+        return due
+
+    async def deliver(self, batch: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, int]:
+        """Send (attempt, message) pairs and persist the outcomes in bulk."""
+        bucket = self.buckets[self.provider.name]
+        sent, failed, retried = [], [], []
+        started = time.perf_counter()
+        for attempt, message in batch:
+            if not message.get("to"):
+                failed.append(message)
+                continue
+            await bucket.acquire()
+            try:
+                await asyncio.to_thread(self.provider.send, message["to"], message.get("subject"), message.get("body"))
+                sent.append(message)
+            except Exception as e:
+                if attempt + 1 >= self.max_attempts:
+                    logger.error(f"Giving up on outreach message {message['id']}: {str(e)}")
+                    failed.append(message)
+                else:
+                    delay = min(DELIVERY_BACKOFF_SECONDS * (2 ** attempt), DELIVERY_MAX_BACKOFF_SECONDS)
+                    heapq.heappush(self._retries, (time.monotonic() + delay, attempt + 1, message["id"], message))
+                    retried.append(message["id"])
+                    metrics.increment("delivery.retries")
+
+        marked_sent = set(await asyncio.to_thread(self._mark, [m["id"] for m in sent], "sent"))
+        marked_failed = set(await asyncio.to_thread(self._mark, [m["id"] for m in failed], "failed"))
+        # Messages waiting for a retry stay claimed; restart their lease so no sweep takes them back
+        renewed = set(await asyncio.to_thread(self._renew_lease, retried))
+        lost = set(retried) - renewed
+        if lost:
+            # Swept and claimed elsewhere while this worker was backing off; the new holder retries them
+            self._retries = [entry for entry in self._retries if entry[2] not in lost]
+            heapq.heapify(self._retries)
+        for message_id in lost.union(m["id"] for m in sent + failed):
+            self._claims.pop(message_id, None)
+        # Only outcomes that were recorded are counted; a lost claim is counted by its new holder
+        for new_status, messages, marked in (("sent", sent, marked_sent), ("failed", failed, marked_failed)):
+            for message in messages:
+                if message["id"] in marked:
+                    analytics_aggregator.record_outreach(new_status, previous_status="pending")
+                    record_outreach_status(message, new_status)
+
+        elapsed = time.perf_counter() - started
+        metrics.increment("delivery.sent", len(sent))
+        metrics.increment("delivery.failed", len(failed))
+        metrics.observe("delivery.batch_seconds", elapsed)
+        if sent and elapsed > 0:
+            metrics.set_gauge("delivery.messages_per_second", round(len(sent) / elapsed, 2))
+        return {"sent": len(sent), "failed": len(failed)}
+
+    async def run_once(self) -> Dict[str, int]:
+        if time.monotonic() - self._last_reclaim >= self.lease_seconds / 2:
+            self._last_reclaim = time.monotonic()
+            reclaimed = await asyncio.to_thread(self._reclaim_expired)
+            if reclaimed:
+                logger.warning(f"Reclaimed {reclaimed} outreach messages with expired claims")
+                metrics.increment("delivery.reclaimed", reclaimed)
+        batch = self._due_retries()
+        if len(batch) < self.batch_size:
+            claimed = await asyncio.to_thread(self._claim_batch, self.batch_size - len(batch))
+            self._claims.update((message["id"], message["claimed_at"]) for message in claimed)
+            batch.extend((0, message) for message in claimed)
+        metrics.set_gauge("delivery.retry_queue", len(self._retries))
+        if not batch:
+            return {"sent": 0, "failed": 0}
+        return await self.deliver(batch)
+
+    async def run(self):
+        while True:
+            try:
+                metrics.set_gauge("delivery.queue_depth", await asyncio.to_thread(self._queue_depth))
+                result = await self.run_once()
+                if not result["sent"] and not result["failed"]:
+                    await asyncio.sleep(DELIVERY_POLL_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outreach delivery cycle failed: {str(e)}")
+                await asyncio.sleep(DELIVERY_POLL_SECONDS)
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        # Hand messages still waiting for a retry, or cut off mid-batch, back to the queue
+        await asyncio.to_thread(self._mark, list(self._claims), "pending")
+        self._retries = []
+        self._claims = {}
+        await asyncio.to_thread(self.provider.close)
@@ -0,0 +1,95 @@
+from typing import List
+from xml.etree.ElementTree import iterparse
+import re
+import zipfile
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+PARAGRAPH = W + "p"
+TEXT = W + "t"
+TAB = W + "tab"
+BREAKS = (W + "br", W + "cr")
+CELL = W + "tc"
+ROW = W + "tr"
+
+HEADER_PART = re.compile(r"^word/header(\d*)\.xml$")
+
+def _header_parts(names: List[str]) -> List[str]:
+    headers = [(int(match.group(1) or 0), name) for name in names for match in [HEADER_PART.match(name)] if match]
+    return [name for _, name in sorted(headers)]
+
+def _part_lines(stream) -> List[str]:
+    """Text lines of one WordprocessingML part, in document order.
+
+    Paragraphs become lines; a table row becomes one line with its cells joined
+    by " | ". Text boxes are read once (their mc:Fallback copy is skipped), and
+    every element is detached from its parent once handled so memory stays flat.
+    """
+    lines: List[str] = []
+    paragraphs: List[List[str]] = []
+    cells: List[List[str]] = []
+    rows: List[List[str]] = []
+    elements = []
+    fallback_depth = 0
+
+    def emit(line: str):
+        # Inside a table cell text belongs to the cell, otherwise it is a line of its own
+        if cells:
+            cells[-1].append(line)
+        else:
+            lines.append(line + "\n")
+
+    for event, element in iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            elements.append(element)
+            if tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif fallback_depth:
+                pass
+            elif tag == PARAGRAPH:
+                paragraphs.append([])
+            elif tag == CELL:
+                cells.append([])
+            elif tag == ROW:
+                rows.append([])
+            continue
+
+        elements.pop()
+        if tag == MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif tag == TEXT:
+            if paragraphs and element.text:
+                paragraphs[-1].append(element.text)
+        elif tag == TAB:
+            if paragraphs:
+                paragraphs[-1].append("\t")
+        elif tag in BREAKS:
+            if paragraphs:
+                paragraphs[-1].append("\n")
+        elif tag == PARAGRAPH:
+            emit("".join(paragraphs.pop()))
+        elif tag == CELL:
+            text = " ".join(part for part in cells.pop() if part)
+            if rows:
+                rows[-1].append(text)
+        elif tag == ROW:
+            emit(" | ".join(rows.pop()))
+
+        element.clear()
+        if elements:
+            elements[-1].remove(element)
+    return lines
+
+def extract_docx_text(file_path: str) -> str:
+    """Text of a .docx (headers, then body incl. tables and text boxes) without python-docx."""
+    with zipfile.ZipFile(file_path) as archive:
+        parts = _header_parts(archive.namelist()) + ["word/document.xml"]
+        lines: List[str] = []
+        for part in parts:
+            with archive.open(part) as stream:
+                lines.extend(_part_lines(stream))
+    return "".join(lines)
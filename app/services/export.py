@@ -0,0 +1,103 @@
+from supabase import create_client, Client
+from typing import Dict, Any, List, Iterator, Tuple
+from app.services.metrics import metrics
+import csv
+import io
+import json
+import os
+import time
+import zlib
+from dotenv import load_dotenv
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Initialize Supabase client
+supabase: Client = create_client(
+    os.getenv("SUPABASE_URL"),
+    os.getenv("SUPABASE_KEY")
+)
+
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+EXPORT_FORMATS = ("csv", "ndjson")
+
+CANDIDATE_EXPORT_COLUMNS = [
+    "id", "full_name", "email", "phone", "location", "skills", "experience_years",
+    "current_position", "desired_position", "resume_url", "summary", "score", "status",
+    "created_at", "updated_at"
+]
+OUTREACH_EXPORT_COLUMNS = [
+    "id", "template_id", "candidate_id", "subject", "body", "status", "sent_at", "created_at"
+]
+
+def iter_table_pages(table: str, columns: str = "*", page_size: int = EXPORT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Yield pages of a table in id order using keyset pagination (no OFFSET scans)."""
+    last_id = None
+    while True:
+        query = supabase.table(table)\
+            .select(columns)\
+            .order("id")\
+            .limit(page_size)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = query.execute().data or []
+        if page:
+            yield page
+        if len(page) < page_size:
+            break
+        last_id = page[-1]["id"]
+
+def _csv_value(value: Any) -> Any:
+    # Arrays and objects are written as JSON so the cell round-trips
+    return json.dumps(value) if isinstance(value, (list, dict)) else value
+
+def _encode_pages(pages: Iterator[List[Dict[str, Any]]], fmt: str, columns: List[str]) -> Iterator[Tuple[bytes, int]]:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for page in pages:
+            for row in page:
+                writer.writerow([_csv_value(row.get(column)) for column in columns])
+            yield buffer.getvalue().encode("utf-8"), len(page)
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue().encode("utf-8"), 0
+    else:
+        for page in pages:
+            chunk = "".join(json.dumps(row, default=str) + "\n" for row in page)
+            yield chunk.encode("utf-8"), len(page)
+
+def stream_export(table: str, columns: List[str], fmt: str = "ndjson", compress: bool = False) -> Iterator[bytes]:
+    """Stream a whole table as CSV or NDJSON, one page in memory at a time."""
+    started = time.perf_counter()
+    rows = 0
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31 -> gzip container
+    pages = iter_table_pages(table, ",".join(columns))
+    try:
+        for chunk, count in _encode_pages(pages, fmt, columns):
+            rows += count
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+        if compressor:
+            yield compressor.flush()
+    finally:
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed > 0 else 0
+        metrics.increment(f"export.{table}.rows", rows)
+        metrics.observe(f"export.{table}.seconds", elapsed)
+        logger.info(f"Exported {rows} rows from {table} as {fmt}{'.gz' if compress else ''} in {elapsed:.2f}s ({rate:.0f} rows/sec)")
+
+def export_filename(table: str, fmt: str, compress: bool) -> str:
+    return f"{table}.{fmt}{'.gz' if compress else ''}"
+
+def export_media_type(fmt: str, compress: bool) -> str:
+    if compress:
+        return "application/gzip"
+    return "text/csv" if fmt == "csv" else "application/x-ndjson"
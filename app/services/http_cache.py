@@ -0,0 +1,37 @@
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from typing import Any, Callable
+import hashlib
+import json
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from cheap validators (ids, updated_at values, generation counters)."""
+    digest = hashlib.sha1(json.dumps(parts, default=str, sort_keys=True).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match header already names this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [value.strip() for value in header.split(",")]
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    return any(value == etag or value == f"W/{etag}" for value in candidates)
+
+def _cache_headers(etag: str, cache_control: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Authorization"
+    }
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers=_cache_headers(etag, cache_control))
+
+def conditional_json(request: Request, etag: str, build: Callable[[], Any], cache_control: str) -> Response:
+    """Answer 304 when the client's copy is current; otherwise build and serialize the payload."""
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    return JSONResponse(content=build(), headers=_cache_headers(etag, cache_control))
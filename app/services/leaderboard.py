@@ -0,0 +1,148 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple, Any
+from app.services.export import iter_table_pages
+import threading
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Only the fields needed to rank, filter and serialize a leaderboard entry
+LEADERBOARD_COLUMNS = "id,created_at,updated_at,score,status,skills,location"
+
+GLOBAL_BOARD = ("global", "")
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+def _rank_key(row: Dict[str, Any]) -> Tuple[float, str]:
+    # Highest score first, unscored candidates last, ties broken by id
+    score = row.get("score")
+    return (-float(score) if score is not None else float("inf"), row["id"])
+
+def _board_keys(row: Dict[str, Any]) -> List[Tuple[str, str]]:
+    keys = [GLOBAL_BOARD]
+    for skill in {_normalize(s) for s in row.get("skills") or []}:
+        if skill:
+            keys.append(("skill", skill))
+    location = _normalize(row.get("location"))
+    if location:
+        keys.append(("location", location))
+    return keys
+
+class Leaderboard:
+    """In-process ranked candidate indexes: one global board plus one per skill and per location.
+
+    Every board is a sorted list of (rank key, candidate id), so reading the top k
+    entries is a slice and a write is a binary search per board the candidate is on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._boards: Dict[Tuple[str, str], List[Tuple[float, str]]] = {}
+        self.ready = False
+
+    def _insert(self, row: Dict[str, Any]):
+        key = _rank_key(row)
+        for board in _board_keys(row):
+            insort(self._boards.setdefault(board, []), key)
+
+    def _remove(self, row: Dict[str, Any]):
+        key = _rank_key(row)
+        for board_key in _board_keys(row):
+            board = self._boards.get(board_key)
+            if not board:
+                continue
+            index = bisect_left(board, key)
+            if index < len(board) and board[index] == key:
+                del board[index]
+            if not board and board_key != GLOBAL_BOARD:
+                del self._boards[board_key]
+
+    def upsert(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Insert or replace a candidate and return the previously indexed row, if any."""
+        if not row or not row.get("id"):
+            return None
+        compact = {field: row.get(field) for field in LEADERBOARD_COLUMNS.split(",")}
+        with self._lock:
+            previous = self._rows.get(compact["id"])
+            if previous is not None:
+                # Merge so partial rows (e.g. a score-only update) keep the other fields
+                compact = {**previous, **{k: v for k, v in compact.items() if k in row}}
+                self._remove(previous)
+            self._rows[compact["id"]] = compact
+            self._insert(compact)
+        return previous
+
+    def remove(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """Drop a candidate from every board."""
+        with self._lock:
+            previous = self._rows.pop(candidate_id, None)
+            if previous is not None:
+                self._remove(previous)
+        return previous
+
+    def get(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        return self._rows.get(candidate_id)
+
+    def load(self, rows: List[Dict[str, Any]]):
+        """Replace the whole index with the given rows."""
+        rows_by_id = {}
+        boards: Dict[Tuple[str, str], List[Tuple[float, str]]] = {GLOBAL_BOARD: []}
+        for row in rows:
+            compact = {field: row.get(field) for field in LEADERBOARD_COLUMNS.split(",")}
+            rows_by_id[compact["id"]] = compact
+        for compact in rows_by_id.values():
+            key = _rank_key(compact)
+            for board in _board_keys(compact):
+                boards.setdefault(board, []).append(key)
+        for board in boards.values():
+            board.sort()
+        with self._lock:
+            self._rows = rows_by_id
+            self._boards = boards
+            self.ready = True
+
+    def top(self, limit: int = 10, skill: Optional[str] = None, location: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the top candidates, optionally restricted to a skill and/or location."""
+        with self._lock:
+            boards = []
+            if skill:
+                boards.append(self._boards.get(("skill", _normalize(skill)), []))
+            if location:
+                boards.append(self._boards.get(("location", _normalize(location)), []))
+            if not boards:
+                boards.append(self._boards.get(GLOBAL_BOARD, []))
+
+            # Walk the smallest board in rank order and filter by membership in the others
+            boards.sort(key=len)
+            driver, others = boards[0], boards[1:]
+            wanted_skill = _normalize(skill)
+            wanted_location = _normalize(location)
+            result = []
+            for _, candidate_id in driver:
+                row = self._rows[candidate_id]
+                if others:
+                    if wanted_skill and wanted_skill not in {_normalize(s) for s in row.get("skills") or []}:
+                        continue
+                    if wanted_location and _normalize(row.get("location")) != wanted_location:
+                        continue
+                result.append(dict(row))
+                if len(result) >= limit:
+                    break
+            return result
+
+# Shared per-process index, fed by candidate writes and rebuilt on startup
+leaderboard = Leaderboard()
+
+def rebuild_leaderboards() -> int:
+    """Reload every leaderboard from the candidates table, paging by id."""
+    rows = []
+    for page in iter_table_pages("candidates", LEADERBOARD_COLUMNS):
+        rows.extend(page)
+
+    leaderboard.load(rows)
+    logger.info(f"Leaderboards rebuilt from {len(rows)} candidates")
+    return len(rows)
@@ -0,0 +1,105 @@
+from fastapi import HTTPException, status
+from postgrest.types import ReturnMethod
+from supabase import create_client, Client
+from typing import Dict, Any, List, Optional
+from app.services.analytics import analytics_aggregator
+from app.services.rollups import record_outreach_status
+from app.services.candidate import fetch_candidates
+from app.services.templates import render_message, compile_text
+import os
+from dotenv import load_dotenv
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Initialize Supabase client
+supabase: Client = create_client(
+    os.getenv("SUPABASE_URL"),
+    os.getenv("SUPABASE_KEY")
+)
+
+MESSAGE_INSERT_CHUNK = 500
+
+def fetch_template(template_id: str) -> Dict[str, Any]:
+    """Fetch one outreach template or raise 404."""
+    result = supabase.table("outreach_templates")\
+        .select("*")\
+        .eq("id", template_id)\
+        .execute()
+    if not result.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Template not found"
+        )
+    return result.data[0]
+
+def fetch_candidate(candidate_id: str) -> Dict[str, Any]:
+    """Fetch one candidate or raise 404."""
+    result = supabase.table("candidates")\
+        .select("*")\
+        .eq("id", candidate_id)\
+        .execute()
+    if not result.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found"
+        )
+    return result.data[0]
+
+def build_message(template: Dict[str, Any], candidate: Dict[str, Any], message_status: str = "pending") -> Dict[str, Any]:
+    """Build an outreach_messages row: ids plus the rendered subject and body only."""
+    subject, body = render_message(template, candidate)
+    return {
+        "template_id": template["id"],
+        "candidate_id": candidate["id"],
+        "subject": subject,
+        "body": body,
+        "status": message_status
+    }
+
+def prepare_single_message(message: Dict[str, Any], template: Dict[str, Any], candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the row for a single send; an explicit subject/body overrides the template's."""
+    message_data = build_message(template, candidate, message.get("status") or "pending")
+    for field in ("subject", "body"):
+        if message.get(field):
+            message_data[field] = compile_text(message[field])(candidate)
+    if message.get("sent_at"):
+        sent_at = message["sent_at"]
+        message_data["sent_at"] = sent_at.isoformat() if hasattr(sent_at, "isoformat") else sent_at
+    return message_data
+
+def send_bulk_outreach(template_id: str, candidate_ids: List[str], message_status: str = "pending", sender_id: Optional[str] = None) -> Dict[str, Any]:
+    """Create one outreach message per candidate with a constant number of round trips per chunk."""
+    template = fetch_template(template_id)
+
+    # Preserve request order and drop duplicate ids
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    candidates = fetch_candidates(candidate_ids)
+    missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in candidates]
+
+    messages = [
+        build_message(template, candidates[candidate_id], message_status)
+        for candidate_id in candidate_ids if candidate_id in candidates
+    ]
+
+    inserted = 0
+    for start in range(0, len(messages), MESSAGE_INSERT_CHUNK):
+        chunk = messages[start:start + MESSAGE_INSERT_CHUNK]
+        supabase.table("outreach_messages")\
+            .insert(chunk, returning=ReturnMethod.minimal)\
+            .execute()
+        inserted += len(chunk)
+        for message in chunk:
+            analytics_aggregator.record_outreach(message["status"], candidate_id=message["candidate_id"], sender_id=sender_id)
+            record_outreach_status(message)
+
+    logger.info(f"Bulk outreach for template {template_id}: {inserted} messages, {len(missing)} missing candidates")
+    return {
+        "template_id": template_id,
+        "inserted": inserted,
+        "missing_candidate_ids": missing
+    }
@@ -0,0 +1,149 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException, status
+from typing import Any, Callable, Optional, Tuple
+from app.services.metrics import metrics
+import asyncio
+import multiprocessing
+import os
+import time
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+PARSE_POOL_WORKERS = int(os.getenv("PARSE_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSE_POOL_MAX_PENDING = int(os.getenv("PARSE_POOL_MAX_PENDING", "32"))
+PARSE_JOB_TIMEOUT_SECONDS = float(os.getenv("PARSE_JOB_TIMEOUT_SECONDS", "60"))
+
+def _warm() -> int:
+    return os.getpid()
+
+def _run_job(fn: Callable, args: Tuple, submitted_at: float) -> Tuple[Any, float, float]:
+    started_at = time.time()
+    result = fn(*args)
+    return result, started_at - submitted_at, time.time() - started_at
+
+class ParsePool:
+    """Process pool for CPU-bound resume parsing.
+
+    Workers are spawned ahead of the first job. At most `max_pending`
+    jobs may be queued or running; beyond that callers get a 429. A job that runs
+    past `timeout` gets a 504 and the pool is torn down (terminating the stuck worker)
+    and recreated on the next submit.
+    """
+
+    def __init__(self, workers: int = PARSE_POOL_WORKERS, max_pending: int = PARSE_POOL_MAX_PENDING, timeout: float = PARSE_JOB_TIMEOUT_SECONDS, initializer: Optional[Callable] = None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.initializer = initializer
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the parent holds event-loop and HTTP client threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer
+            )
+        return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor):
+        # Only tear down the pool the failed job ran on; it may already have been replaced
+        if executor is not self._executor:
+            return
+        self._executor = None
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Respawn (and reload models) now rather than inside the next job's timeout
+        asyncio.get_running_loop().create_task(self.start())
+
+    async def start(self):
+        """Spawn every worker up front so the first uploads don't pay for process startup and imports."""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm) for _ in range(self.workers)))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _broken(self, executor: ProcessPoolExecutor) -> HTTPException:
+        # A worker died (or was terminated for another job's timeout)
+        metrics.increment("parse_pool.broken")
+        self._reset(executor)
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Resume parser restarted, please retry"
+        )
+
+    def _job_done(self, future: asyncio.Future):
+        self.pending -= 1
+        metrics.set_gauge("parse_pool.pending", self.pending)
+        # Results of jobs nobody waits for any more are dropped here, not reported as unretrieved
+        if not future.cancelled():
+            future.exception()
+
+    def _expire(self, future: asyncio.Future, executor: ProcessPoolExecutor, fn: Callable):
+        if not future.done():
+            logger.error(f"Abandoned parse job {getattr(fn, '__name__', fn)} is still running; restarting the parse pool")
+            metrics.increment("parse_pool.timeouts")
+            self._reset(executor)
+
+    async def run(self, fn: Callable, *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run `fn(*args)` in a worker process; `fn` must be importable at module level.
+
+        `timeout` (capped at the pool's own) lets callers with a tighter deadline have
+        the worker killed at that deadline instead of leaving it busy after they give up.
+        """
+        if self.pending >= self.max_pending:
+            metrics.increment("parse_pool.rejected")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Resume parser is busy, please retry shortly",
+                headers={"Retry-After": "5"}
+            )
+
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            job = executor.submit(_run_job, fn, args, time.time())
+        except BrokenProcessPool:
+            raise self._broken(executor)
+        future = asyncio.wrap_future(job)
+        # A job counts as pending until its worker is free again, even if the caller stops waiting
+        self.pending += 1
+        metrics.set_gauge("parse_pool.pending", self.pending)
+        future.add_done_callback(self._job_done)
+        deadline = loop.time() + timeout
+        try:
+            result, queue_wait, parse_time = await asyncio.wait_for(asyncio.shield(future), timeout)
+            metrics.observe("parse_pool.queue_wait_seconds", queue_wait)
+            metrics.observe("parse_pool.parse_seconds", parse_time)
+            return result
+        except asyncio.TimeoutError:
+            logger.error(f"Parse job {getattr(fn, '__name__', fn)} exceeded {timeout:g}s; restarting the parse pool")
+            metrics.increment("parse_pool.timeouts")
+            self._reset(executor)
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Resume parsing timed out"
+            )
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. its own deadline or a failed sibling job); a job that has not
+            # started is dropped, one already running is stopped once its time is up
+            if not job.cancel():
+                loop.call_later(max(0.0, deadline - loop.time()), self._expire, future, executor, fn)
+            raise
+        except BrokenProcessPool:
+            raise self._broken(executor)
+
+# Shared per-process pool
+parse_pool = ParsePool()
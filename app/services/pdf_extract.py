@@ -0,0 +1,115 @@
+from typing import List, Optional, Tuple
+from app.services.parse_pool import parse_pool
+import asyncio
+import os
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+# Documents with more pages than this are split across parse pool workers
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_PAGES_PER_JOB = int(os.getenv("PDF_PAGES_PER_JOB", "4"))
+# Page ranges of one document in the pool at a time, so a long PDF cannot take every pending slot
+PDF_MAX_JOBS_PER_DOCUMENT = int(os.getenv("PDF_MAX_JOBS_PER_DOCUMENT", "4"))
+
+# pdfplumber's default table finder needs ruling lines in both directions
+MIN_TABLE_EDGES = 2
+
+ENGINES = ("pypdf", "pdfplumber")
+
+def page_may_have_tables(page) -> bool:
+    """True when the page has enough horizontal and vertical edges to form a table."""
+    horizontal = vertical = 0
+    for edge in page.edges:
+        if edge["orientation"] == "h":
+            horizontal += 1
+        else:
+            vertical += 1
+        if horizontal >= MIN_TABLE_EDGES and vertical >= MIN_TABLE_EDGES:
+            return True
+    return False
+
+def _pdfplumber_pages(file_path: str, start: int, stop: int) -> List[str]:
+    import pdfplumber
+    pieces = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            # Extract text with layout preservation
+            page_text = page.extract_text()
+            if page_text:
+                pieces.append(page_text + "\n")
+            # Table detection is the slowest call, so only run it where tables can exist
+            if page_may_have_tables(page):
+                for table in page.extract_tables():
+                    for row in table:
+                        pieces.append(" ".join([str(cell) for cell in row if cell]) + "\n")
+            # Release the page's parsed layout objects as we go
+            page.close()
+    return pieces
+
+def _pypdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    import PyPDF2
+    reader = PyPDF2.PdfReader(file_path)
+    return [page.extract_text() or "" for page in reader.pages[start:stop]]
+
+def extract_page_range(file_path: str, start: int, stop: int, engine: str = "pdfplumber") -> List[str]:
+    """Text pieces for pages [start, stop), in order; importable so it can run in a worker."""
+    if engine == "pdfplumber":
+        return _pdfplumber_pages(file_path, start, stop)
+    if engine == "pypdf":
+        return _pypdf_pages(file_path, start, stop)
+    raise ValueError(f"Unknown PDF engine: {engine}")
+
+def count_pages(file_path: str, engine: str = "pdfplumber") -> int:
+    """Page count as seen by the engine that will extract the pages."""
+    if engine == "pdfplumber":
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+    import PyPDF2
+    return len(PyPDF2.PdfReader(file_path).pages)
+
+def _capped(pages: int, max_pages: int, file_path: str) -> int:
+    if pages > max_pages:
+        logger.info(f"PDF {file_path} has {pages} pages; extracting the first {max_pages}")
+        return max_pages
+    return pages
+
+def assemble(pieces: List[str], engine: str) -> str:
+    # One join at the end instead of repeated string concatenation
+    text = "".join(pieces)
+    return text.strip() if engine == "pdfplumber" else text
+
+def extract_pdf_text(file_path: str, engine: str = "pdfplumber", max_pages: int = PDF_MAX_PAGES) -> str:
+    """Extract a PDF's text in this process."""
+    stop = _capped(count_pages(file_path, engine), max_pages, file_path)
+    return assemble(extract_page_range(file_path, 0, stop, engine), engine)
+
+def page_ranges(pages: int, per_job: int = PDF_PAGES_PER_JOB) -> List[Tuple[int, int]]:
+    return [(start, min(start + per_job, pages)) for start in range(0, pages, per_job)]
+
+async def extract_pdf_text_parallel(file_path: str, engine: str = "pdfplumber", max_pages: int = PDF_MAX_PAGES, timeout: Optional[float] = None) -> str:
+    """Extract a PDF's text in the parse pool, fanning long documents out by page range; `timeout` bounds each pool job."""
+    pages = _capped(await asyncio.to_thread(count_pages, file_path, engine), max_pages, file_path)
+    if pages <= PDF_PARALLEL_MIN_PAGES:
+        pieces = await parse_pool.run(extract_page_range, file_path, 0, pages, engine, timeout=timeout)
+        return assemble(pieces, engine)
+
+    in_flight = asyncio.Semaphore(PDF_MAX_JOBS_PER_DOCUMENT)
+
+    async def extract(start: int, stop: int) -> List[str]:
+        async with in_flight:
+            return await parse_pool.run(extract_page_range, file_path, start, stop, engine, timeout=timeout)
+
+    tasks = [asyncio.ensure_future(extract(start, stop)) for start, stop in page_ranges(pages)]
+    try:
+        chunks = await asyncio.gather(*tasks)
+    except BaseException:
+        # One range failed (429, 504, ...); the others' results are useless, so free their slots
+        for task in tasks:
+            task.cancel()
+        raise
+    return assemble([piece for chunk in chunks for piece in chunk], engine)
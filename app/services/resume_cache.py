@@ -0,0 +1,114 @@
+from typing import Dict, Any, Optional
+from app.services.metrics import metrics
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", "data/resume_cache.sqlite3")
+RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+class ResumeCache:
+    """Content-addressed store of resume parse results in a local SQLite file.
+
+    Keys combine the SHA-256 of the uploaded file with the parser and prompt
+    versions, so changing either simply stops old entries from matching. Entries
+    are evicted least-recently-used once the stored text and results exceed
+    `max_bytes`.
+    """
+
+    def __init__(self, path: str = RESUME_CACHE_PATH, max_bytes: int = RESUME_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            # WAL lets every API worker process read while one writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS resume_cache ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, result TEXT NOT NULL, "
+                "file_size INTEGER NOT NULL, size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS resume_cache_accessed_at ON resume_cache (accessed_at)")
+            self._connection = connection
+        return self._connection
+
+    def _record_lookup(self, hit: bool, file_size: int = 0):
+        if hit:
+            self.hits += 1
+            metrics.increment("resume_cache.hits")
+            # Upload bytes that did not need extracting or sending to the LLM
+            metrics.increment("resume_cache.bytes_saved", file_size)
+        else:
+            self.misses += 1
+            metrics.increment("resume_cache.misses")
+        metrics.set_gauge("resume_cache.hit_rate", round(self.hits / (self.hits + self.misses), 4))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return {"text", "result"} for a cached parse, or None."""
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT text, result, file_size FROM resume_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    with connection:
+                        connection.execute("UPDATE resume_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            # A broken cache must never fail an upload
+            logger.error(f"Resume cache lookup failed: {str(e)}")
+            return None
+
+        self._record_lookup(row is not None, row[2] if row is not None else 0)
+        if row is None:
+            return None
+        return {"text": row[0], "result": json.loads(row[1])}
+
+    def put(self, key: str, text: str, result: Dict[str, Any], file_size: int):
+        result_json = json.dumps(result, default=str)
+        size = len(text.encode("utf-8")) + len(result_json.encode("utf-8"))
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO resume_cache (key, text, result, file_size, size, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, text, result_json, file_size, size, time.time())
+                    )
+                    self._evict(connection)
+        except sqlite3.Error as e:
+            logger.error(f"Resume cache write failed: {str(e)}")
+
+    def _evict(self, connection: sqlite3.Connection):
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM resume_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            metrics.set_gauge("resume_cache.bytes", total)
+            return
+        evicted = 0
+        for key, size in connection.execute("SELECT key, size FROM resume_cache ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM resume_cache WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        metrics.increment("resume_cache.evictions", evicted)
+        metrics.set_gauge("resume_cache.bytes", total)
+
+# Shared per-process cache (the SQLite file is shared between processes)
+resume_cache = ResumeCache()
@@ -0,0 +1,58 @@
+from typing import Any, Dict, List, Optional
+from app.services.resume_sections import extract_contact
+from app.services.skill_matcher import skill_matcher
+import re
+
+# Light enough to import in parse pool workers: no Supabase client, no NLTK downloads
+
+EDUCATION_PATTERNS = [
+    r"(?i)(bachelor|master|phd|b\.?s\.?|m\.?s\.?|b\.?e\.?|m\.?e\.?)",
+    r"(?i)(university|college|institute|school)",
+    r"(?i)(computer science|engineering|information technology|it)"
+]
+
+EXPERIENCE_PATTERNS = [
+    r"(?i)(years? of experience)",
+    r"(?i)(senior|junior|lead|principal)",
+    r"(?i)(developer|engineer|architect|consultant)"
+]
+
+def _contexts(text: str, patterns: List[str]) -> List[Dict[str, str]]:
+    found = []
+    for pattern in patterns:
+        for match in re.finditer(pattern, text):
+            # Get surrounding context
+            start = max(0, match.start() - 50)
+            end = min(len(text), match.end() + 50)
+            found.append({"context": text[start:end].strip()})
+    return found
+
+def extract_education(text: str) -> List[Dict[str, str]]:
+    """Extract education information using pattern matching."""
+    return _contexts(text, EDUCATION_PATTERNS)
+
+def extract_experience(text: str) -> List[Dict[str, str]]:
+    """Extract work experience using pattern matching."""
+    return _contexts(text, EXPERIENCE_PATTERNS)
+
+def personal_info(text: str, contact: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, str]:
+    """Name and contact details from the first line and the contact regexes."""
+    if contact is None:
+        contact = extract_contact(text)
+    return {
+        # Name (first line usually contains the name)
+        "name": text.split('\n')[0].strip() if text else "",
+        "email": contact["email"] or "",
+        "phone": contact["phone"] or "",
+        "location": "",  # Location extraction would require more complex NLP
+        "summary": ""    # Summary extraction would require more complex NLP
+    }
+
+def heuristic_entities(text: str, contact: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, Any]:
+    """Every rule-based extractor over one resume; runs in the parse pool."""
+    return {
+        "skills": skill_matcher.match(text),
+        "education": extract_education(text),
+        "experience": extract_experience(text),
+        "personal_info": personal_info(text, contact)
+    }
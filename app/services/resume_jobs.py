@@ -0,0 +1,428 @@
+from fastapi import HTTPException, status
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.services.metrics import metrics
+from app.services.uploads import StoredUpload
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+RESUME_JOBS_PATH = os.getenv("RESUME_JOBS_PATH", "data/resume_jobs.sqlite3")
+RESUME_JOB_UPLOAD_DIR = os.getenv("RESUME_JOB_UPLOAD_DIR", "data/resume_uploads")
+RESUME_JOB_WORKERS = int(os.getenv("RESUME_JOB_WORKERS", "2"))
+RESUME_JOB_QUEUE_SIZE = int(os.getenv("RESUME_JOB_QUEUE_SIZE", "100"))
+RESUME_JOB_MAX_ATTEMPTS = int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "3"))
+# How often event streams re-read a job they have not been notified about (e.g. run by another process)
+RESUME_JOB_POLL_SECONDS = float(os.getenv("RESUME_JOB_POLL_SECONDS", "1"))
+RESUME_JOB_KEEPALIVE_SECONDS = float(os.getenv("RESUME_JOB_KEEPALIVE_SECONDS", "15"))
+# A running job whose owner stops renewing its lease for this long is assumed orphaned and requeued
+RESUME_JOB_LEASE_SECONDS = float(os.getenv("RESUME_JOB_LEASE_SECONDS", "60"))
+# Finished jobs (and their results) are deleted this long after they finish
+RESUME_JOB_RETENTION_SECONDS = float(os.getenv("RESUME_JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+# Progress reported as each resume pipeline stage starts
+STAGE_PROGRESS = {"queued": 0, "extract": 10, "segment": 30, "entities": 40, "llm": 60, "normalize": 90, "completed": 100}
+FINISHED = ("succeeded", "failed")
+
+JOB_COLUMNS = ("id", "user_id", "filename", "path", "size", "sha256", "status", "stage", "progress",
+               "result", "error", "attempts", "created_at", "updated_at", "owner", "lease_expires_at")
+# Added after the first release; older job files get them on open
+LEASE_COLUMNS = (("owner", "TEXT"), ("lease_expires_at", "REAL"))
+
+class ResumeJobStore:
+    """Resume parse jobs persisted in a local SQLite file so they survive restarts.
+
+    A running job is leased to the process that claimed it (`owner`) until
+    `lease_expires_at`; owners renew their leases while they work, so only jobs
+    whose owner has died are requeued, even with several processes sharing the file.
+    """
+
+    def __init__(self, path: str = RESUME_JOBS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS resume_jobs ("
+                "id TEXT PRIMARY KEY, user_id TEXT NOT NULL, filename TEXT NOT NULL, path TEXT NOT NULL, "
+                "size INTEGER NOT NULL, sha256 TEXT NOT NULL, status TEXT NOT NULL, stage TEXT NOT NULL, "
+                "progress INTEGER NOT NULL, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, owner TEXT, lease_expires_at REAL)"
+            )
+            existing = {row[1] for row in connection.execute("PRAGMA table_info(resume_jobs)")}
+            for column, column_type in LEASE_COLUMNS:
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE resume_jobs ADD COLUMN {column} {column_type}")
+            connection.execute("CREATE INDEX IF NOT EXISTS resume_jobs_status ON resume_jobs (status)")
+            self._connection = connection
+        return self._connection
+
+    def _row(self, row) -> Dict[str, Any]:
+        job = dict(zip(JOB_COLUMNS, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def create(self, job_id: str, user_id: str, filename: str, path: str, size: int, sha256: str) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT INTO resume_jobs (id, user_id, filename, path, size, sha256, status, stage, progress, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 'queued', 'queued', 0, ?, ?)",
+                    (job_id, user_id, filename, path, size, sha256, now, now)
+                )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM resume_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row(row) if row is not None else None
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float = RESUME_JOB_LEASE_SECONDS) -> bool:
+        """Mark a queued job running under `owner`'s lease; False when another worker got there first."""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                claimed = connection.execute(
+                    "UPDATE resume_jobs SET status = 'running', attempts = attempts + 1, owner = ?, "
+                    "lease_expires_at = ?, updated_at = ? WHERE id = ? AND status = 'queued'",
+                    (owner, now + lease_seconds, now, job_id)
+                ).rowcount
+        return claimed == 1
+
+    def renew(self, owner: str, lease_seconds: float = RESUME_JOB_LEASE_SECONDS) -> int:
+        """Extend the lease on every job `owner` is running."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                return connection.execute(
+                    "UPDATE resume_jobs SET lease_expires_at = ? WHERE owner = ? AND status = 'running'",
+                    (time.time() + lease_seconds, owner)
+                ).rowcount
+
+    def release(self, owner: str) -> int:
+        """Expire `owner`'s leases so the next sweep, in any process, requeues its running jobs."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                return connection.execute(
+                    "UPDATE resume_jobs SET lease_expires_at = NULL WHERE owner = ? AND status = 'running'",
+                    (owner,)
+                ).rowcount
+
+    def update(self, job_id: str, **changes):
+        if "result" in changes:
+            changes["result"] = json.dumps(changes["result"], default=str)
+        changes["updated_at"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in changes)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    f"UPDATE resume_jobs SET {assignments} WHERE id = ?", (*changes.values(), job_id)
+                )
+
+    def requeue_expired(self, max_attempts: int = RESUME_JOB_MAX_ATTEMPTS) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Requeue running jobs whose lease has expired; returns (requeued, failed).
+
+        Jobs that have already been attempted `max_attempts` times are failed instead,
+        so a resume that crashes the worker cannot loop forever.
+        """
+        now = time.time()
+        expired = "status = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                rows = connection.execute(
+                    f"SELECT {', '.join(JOB_COLUMNS)} FROM resume_jobs WHERE {expired}", (now,)
+                ).fetchall()
+                connection.execute(
+                    "UPDATE resume_jobs SET status = 'failed', error = 'Too many attempts', owner = NULL, "
+                    f"lease_expires_at = NULL, updated_at = ? WHERE {expired} AND attempts >= ?",
+                    (now, now, max_attempts)
+                )
+                connection.execute(
+                    "UPDATE resume_jobs SET status = 'queued', stage = 'queued', progress = 0, owner = NULL, "
+                    f"lease_expires_at = NULL, updated_at = ? WHERE {expired}",
+                    (now, now)
+                )
+        jobs = [self._row(row) for row in rows]
+        return (
+            [job for job in jobs if job["attempts"] < max_attempts],
+            [job for job in jobs if job["attempts"] >= max_attempts]
+        )
+
+    def queued(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM resume_jobs WHERE status = 'queued' ORDER BY created_at"
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def prune(self, retention_seconds: float = RESUME_JOB_RETENTION_SECONDS) -> List[Dict[str, Any]]:
+        """Delete jobs that finished more than `retention_seconds` ago and return them."""
+        cutoff = time.time() - retention_seconds
+        finished = "status IN ('succeeded', 'failed') AND updated_at < ?"
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                rows = connection.execute(
+                    f"SELECT {', '.join(JOB_COLUMNS)} FROM resume_jobs WHERE {finished}", (cutoff,)
+                ).fetchall()
+                connection.execute(f"DELETE FROM resume_jobs WHERE {finished}", (cutoff,))
+        return [self._row(row) for row in rows]
+
+def remove_job_files(jobs: List[Dict[str, Any]]):
+    """Delete the stored uploads of jobs that will not run again."""
+    for job in jobs:
+        try:
+            os.remove(job["path"])
+        except FileNotFoundError:
+            pass
+
+def public_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """The job fields returned to clients (no server-side paths or owner)."""
+    return {
+        "job_id": job["id"],
+        "filename": job["filename"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }
+
+class ResumeJobQueue:
+    """Bounded in-process queue of resume parse jobs worked by a fixed set of asyncio tasks.
+
+    Uploads are moved into `upload_dir` and the job is recorded in the store before
+    it is queued, so another process can pick up whatever this one leaves unfinished.
+    A maintenance task renews this process's leases, requeues jobs whose owner died
+    and prunes old finished jobs. When `max_queued` jobs are already waiting (or
+    being submitted), `submit()` refuses with a 429.
+    """
+
+    def __init__(
+        self,
+        parse: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None,
+        store: Optional[ResumeJobStore] = None,
+        workers: int = RESUME_JOB_WORKERS,
+        max_queued: int = RESUME_JOB_QUEUE_SIZE,
+        upload_dir: str = RESUME_JOB_UPLOAD_DIR,
+        lease_seconds: float = RESUME_JOB_LEASE_SECONDS,
+        retention_seconds: float = RESUME_JOB_RETENTION_SECONDS
+    ):
+        self._parse = parse
+        self.store = store or ResumeJobStore()
+        self.workers = workers
+        self.max_queued = max_queued
+        self.upload_dir = upload_dir
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        # Identifies this process's leases in a job file shared with other processes
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue: Optional[asyncio.Queue] = None
+        # Submissions past the size check but not yet on the queue
+        self._reserved = 0
+        self._tasks: List[asyncio.Task] = []
+        # Set whenever a job changes, so event streams in this process wake immediately
+        self._changed: Dict[str, asyncio.Event] = {}
+
+    @property
+    def parse(self) -> Callable[..., Awaitable[Dict[str, Any]]]:
+        if self._parse is None:
+            from app.services.resume_parser import parse_resume
+            self._parse = parse_resume
+        return self._parse
+
+    def _get_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    def _notify(self, job_id: str):
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _update(self, job_id: str, **changes):
+        await asyncio.to_thread(self.store.update, job_id, **changes)
+        self._notify(job_id)
+
+    async def maintain(self):
+        """Renew this process's leases, requeue orphaned jobs and prune old finished ones."""
+        await asyncio.to_thread(self.store.renew, self.owner, self.lease_seconds)
+        requeued, failed = await asyncio.to_thread(self.store.requeue_expired)
+        queue = self._get_queue()
+        for job in requeued:
+            queue.put_nowait(job["id"])
+        if requeued:
+            logger.info(f"Re-enqueued {len(requeued)} resume jobs with expired leases")
+            metrics.increment("resume_jobs.requeued", len(requeued))
+        pruned = await asyncio.to_thread(self.store.prune, self.retention_seconds)
+        # Jobs that will not run again no longer need their uploads
+        await asyncio.to_thread(remove_job_files, failed + pruned)
+        metrics.set_gauge("resume_jobs.queued", queue.qsize())
+
+    async def _maintain_periodically(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.error(f"Resume job maintenance failed: {str(e)}")
+
+    async def start(self):
+        queue = self._get_queue()
+        await self.maintain()
+        # Queued jobs may be on another process's queue too; claim() lets only one of them run each
+        queued = await asyncio.to_thread(self.store.queued)
+        for job in queued:
+            queue.put_nowait(job["id"])
+        metrics.set_gauge("resume_jobs.queued", queue.qsize())
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._maintain_periodically()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        # Jobs cut off mid-run are requeued by the next sweep instead of waiting out their lease
+        released = await asyncio.to_thread(self.store.release, self.owner)
+        if released:
+            logger.info(f"Released {released} running resume jobs")
+
+    async def submit(self, upload: StoredUpload, user_id: str) -> Dict[str, Any]:
+        """Persist an upload as a queued job and return it; the caller's temp file is moved into `upload_dir`."""
+        queue = self._get_queue()
+        if queue.qsize() + self._reserved >= self.max_queued:
+            metrics.increment("resume_jobs.rejected")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many resumes queued for parsing, please retry shortly"
+            )
+
+        # Hold the slot across the awaits below so concurrent submits cannot overshoot the cap
+        self._reserved += 1
+        try:
+            job_id = str(uuid.uuid4())
+            path = os.path.join(self.upload_dir, job_id + upload.extension)
+            await asyncio.to_thread(os.makedirs, self.upload_dir, exist_ok=True)
+            await asyncio.to_thread(shutil.move, upload.path, path)
+            try:
+                job = await asyncio.to_thread(self.store.create, job_id, user_id, upload.filename, path, upload.size, upload.sha256)
+            except BaseException:
+                os.remove(path)
+                raise
+            queue.put_nowait(job_id)
+        finally:
+            self._reserved -= 1
+        metrics.increment("resume_jobs.submitted")
+        metrics.set_gauge("resume_jobs.queued", queue.qsize())
+        return job
+
+    async def _work(self):
+        queue = self._get_queue()
+        while True:
+            job_id = await queue.get()
+            metrics.set_gauge("resume_jobs.queued", queue.qsize())
+            try:
+                await self.run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Resume job {job_id} crashed: {str(e)}")
+            finally:
+                queue.task_done()
+
+    async def run_job(self, job_id: str):
+        if not await asyncio.to_thread(self.store.claim, job_id, self.owner, self.lease_seconds):
+            return
+        job = await asyncio.to_thread(self.store.get, job_id)
+        self._notify(job_id)
+        upload = StoredUpload(job["path"], job["filename"], None, job["size"], job["sha256"])
+
+        async def progress(stage: str):
+            await self._update(job_id, stage=stage, progress=STAGE_PROGRESS.get(stage, 0))
+
+        started = time.perf_counter()
+        keep_file = False
+        try:
+            result = await self.parse(upload, progress=progress)
+        except asyncio.CancelledError:
+            # stop() hands the job back to the queue, and the next attempt needs the file
+            keep_file = True
+            raise
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.error(f"Resume job {job_id} failed: {detail}")
+            await self._update(job_id, status="failed", error=detail)
+            metrics.increment("resume_jobs.failed")
+        else:
+            await self._update(job_id, status="succeeded", stage="completed", progress=100, result=result)
+            metrics.increment("resume_jobs.succeeded")
+        finally:
+            metrics.observe("resume_jobs.seconds", time.perf_counter() - started)
+            if not keep_file:
+                upload.close()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def events(self, job_id: str) -> AsyncIterator[str]:
+        """Server-Sent Events for a job: one `progress` event per change, then `succeeded` or `failed`."""
+        last_seen = None
+        idle = 0.0
+        while True:
+            event = self._changed.setdefault(job_id, asyncio.Event())
+            job = await self.get(job_id)
+            if job is None:
+                return
+            snapshot = (job["status"], job["stage"], job["updated_at"])
+            if snapshot != last_seen:
+                last_seen = snapshot
+                idle = 0.0
+                name = job["status"] if job["status"] in FINISHED else "progress"
+                yield f"event: {name}\ndata: {json.dumps(public_job(job), default=str)}\n\n"
+                if job["status"] in FINISHED:
+                    self._changed.pop(job_id, None)
+                    return
+            elif idle >= RESUME_JOB_KEEPALIVE_SECONDS:
+                # Comment line so proxies do not close a quiet stream
+                idle = 0.0
+                yield ": keepalive\n\n"
+            try:
+                await asyncio.wait_for(event.wait(), RESUME_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                idle += RESUME_JOB_POLL_SECONDS
+
+# Shared per-process job queue (job state lives in the shared SQLite file)
+resume_jobs = ResumeJobQueue()
@@ -1,26 +1,45 @@
-from typing import Dict, Any, Optional
-import spacy
+from typing import Dict, Any, Optional, Callable, Awaitable
+from fastapi import HTTPException, status
 from langchain_groq import ChatGroq
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
-import PyPDF2
-from docx import Document
-import io
+import asyncio
+import hashlib
+import json
 import os
 from dotenv import load_dotenv
+from app.services.resume_cache import resume_cache
+from app.services.uploads import StoredUpload
+from app.services.resume_sections import build_llm_input, estimate_tokens, RESUME_LLM_TOKEN_BUDGET
+from app.services.metrics import metrics
+import time
 
 load_dotenv()
 
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
+LLM_MODEL = "llama3-70b-8192"  # or another Groq-supported model
 
 # Initialize LangChain with Groq
 llm = ChatGroq(
-    model="llama3-70b-8192",  # or another Groq-supported model
+    model=LLM_MODEL,
     api_key=os.getenv("GROQ_API_KEY")
 )
 
+RESUME_SYSTEM_PROMPT = """You are an expert resume parser. Your task is to extract key information from a resume and output it as a JSON object strictly following the provided schema. Do not include any extra text, explanations, or markdown formatting (like ```json) outside of the JSON object itself. Only output the raw JSON.
+        
+        The resume text is given as its relevant sections. Extract the following information:
+        - Full name
+        - Work experience (list of entries with company, role, duration, and description. Each entry must be a single JSON object with no duplicate keys.)
+        - Education (list of entries with institution, degree, and year)
+        - Professional summary
+        - Total years of experience (as a number)
+
+        Format the output as a JSON object matching the schema. Ensure all keys match the schema exactly."""
+RESUME_USER_PROMPT = "Here is the resume text:\n{text}\n\n{format_instructions}"
+
+# Bump when text extraction or skill matching changes; cached parses from older versions stop matching
+PARSER_VERSION = "3"
+
 class ResumeData(BaseModel):
     """Schema for parsed resume data"""
     full_name: str = Field(description="Full name of the candidate")
@@ -32,81 +51,38 @@ class ResumeData(BaseModel):
     summary: Optional[str] = Field(default=None, description="Professional summary or objective")
     years_of_experience: Optional[float] = Field(default=None, description="Total years of experience")
 
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file"""
-    pdf_file = io.BytesIO(file_content)
-    pdf_reader = PyPDF2.PdfReader(pdf_file)
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text()
-    return text
-
-def extract_text_from_docx(file_content: bytes) -> str:
-    """Extract text from DOCX file"""
-    docx_file = io.BytesIO(file_content)
-    doc = Document(docx_file)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
-
-def extract_text_from_file(file_content: bytes, file_extension: str) -> str:
-    """Extract text from different file formats"""
-    if file_extension.lower() == '.pdf':
-        return extract_text_from_pdf(file_content)
-    elif file_extension.lower() == '.docx':
-        return extract_text_from_docx(file_content)
-    else:
-        raise ValueError(f"Unsupported file format: {file_extension}")
-
-def extract_skills(text: str) -> list[str]:
-    """Extract skills using spaCy NLP"""
-    doc = nlp(text)
-    
-    # Common technical skills to look for
-    technical_skills = {
-        "python", "java", "javascript", "typescript", "react", "angular", "vue",
-        "node.js", "express", "django", "flask", "fastapi", "sql", "nosql",
-        "mongodb", "postgresql", "mysql", "aws", "azure", "gcp", "docker",
-        "kubernetes", "ci/cd", "git", "agile", "scrum", "machine learning",
-        "ai", "data science", "big data", "spark", "hadoop"
-    }
-    
-    # Extract skills using NLP
-    skills = set()
-    for token in doc:
-        if token.text.lower() in technical_skills:
-            skills.add(token.text.lower())
-    
-    return list(skills)
+class ResumeLLMData(BaseModel):
+    """The ResumeData fields only the LLM can fill; contact details and skills are extracted locally"""
+    full_name: str = Field(description="Full name of the candidate")
+    experience: list[Dict[str, Any]] = Field(description="List of work experiences with company, role, duration, and description")
+    education: Optional[list[Dict[str, Any]]] = Field(default=None, description="List of educational qualifications")
+    summary: Optional[str] = Field(default=None, description="Professional summary or objective")
+    years_of_experience: Optional[float] = Field(default=None, description="Total years of experience")
 
-async def parse_resume(file_content: bytes, file_extension: str) -> Dict[str, Any]:
-    """Parse resume using LLM and NLP"""
-    # Extract text from file
-    text = extract_text_from_file(file_content, file_extension)
-    
-    # Extract skills using NLP
-    skills = extract_skills(text)
+# Derived from everything the LLM sees, so any prompt, schema, budget or model change gets fresh cache keys
+PROMPT_VERSION = hashlib.sha256(
+    json.dumps([LLM_MODEL, RESUME_SYSTEM_PROMPT, RESUME_USER_PROMPT, ResumeLLMData.schema(), RESUME_LLM_TOKEN_BUDGET], sort_keys=True).encode("utf-8")
+).hexdigest()[:16]
+
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 3000, 4000, 6000, 8000)
+
+def resume_cache_key(file_sha256: str) -> str:
+    return f"{file_sha256}:{PARSER_VERSION}:{PROMPT_VERSION}"
+
+async def enrich_with_llm(text: str, sections: Dict[str, str]) -> Dict[str, Any]:
+    """Fields only the LLM can fill (ResumeLLMData), from the sections it needs within the token budget"""
+    llm_text, truncated = build_llm_input(text, sections)
+    if truncated:
+        metrics.increment("resume_llm.truncated")
     
     # Create prompt for LLM
     prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are an expert resume parser. Your task is to extract key information from a resume and output it as a JSON object strictly following the provided schema. Do not include any extra text, explanations, or markdown formatting (like ```json) outside of the JSON object itself. Only output the raw JSON.
-        
-        Extract the following information:
-        - Full name
-        - Email address
-        - Phone number
-        - Work experience (list of entries with company, role, duration, and description. Each entry must be a single JSON object with no duplicate keys.)
-        - Education (list of entries with institution, degree, and year)
-        - Professional summary
-        - Total years of experience (as a number)
-
-        Format the output as a JSON object matching the ResumeData schema. Ensure all keys match the schema exactly."""),
-        ("user", "Here is the resume text:\n{text}\n\n{format_instructions}")
+        ("system", RESUME_SYSTEM_PROMPT),
+        ("user", RESUME_USER_PROMPT)
     ])
     
     # Create output parser
-    parser = PydanticOutputParser(pydantic_object=ResumeData)
+    parser = PydanticOutputParser(pydantic_object=ResumeLLMData)
     
     # Create a chain to get raw LLM output
     raw_output_chain = prompt | llm
@@ -114,21 +90,39 @@ async def parse_resume(file_content: bytes, file_extension: str) -> Dict[str, An
     # Get format instructions from the parser
     format_instructions = parser.get_format_instructions()
 
-    # Parse resume
-    try:
-        # Get raw output from the LLM
-        raw_llm_output = await raw_output_chain.ainvoke({"text": text, "format_instructions": format_instructions})
-        print("Raw LLM Output:", raw_llm_output)
+    # Get raw output from the LLM
+    started = time.perf_counter()
+    raw_llm_output = await raw_output_chain.ainvoke({"text": llm_text, "format_instructions": format_instructions})
+    metrics.observe("resume_llm.latency_seconds", time.perf_counter() - started)
+    # Prefer the provider's count; fall back to the estimate of what we sent
+    usage = (getattr(raw_llm_output, "response_metadata", None) or {}).get("token_usage") or {}
+    tokens_sent = usage.get("prompt_tokens") or estimate_tokens(RESUME_SYSTEM_PROMPT + RESUME_USER_PROMPT + format_instructions + llm_text)
+    metrics.observe("resume_llm.tokens_sent", tokens_sent, TOKEN_BUCKETS)
+    print("Raw LLM Output:", raw_llm_output)
 
-        # Parse the raw output using Pydantic parser
-        result = parser.invoke(raw_llm_output)
-        
-        # Add extracted skills to the result
-        result_dict = result.dict()
-        result_dict["skills"] = skills
-        
-        return result_dict
-    except Exception as e:
-        print("Error during parsing:", str(e))
-        # Re-raise a more informative error
-        raise Exception(f"Failed to parse resume: {str(e)}") 
\ No newline at end of file
+    # Parse the raw output using Pydantic parser
+    return parser.invoke(raw_llm_output).dict()
+
+async def parse_resume(upload: StoredUpload, progress: Optional[Callable[[str], Awaitable[None]]] = None) -> Dict[str, Any]:
+    """Parse resume using LLM and NLP; `progress` is awaited with each stage name as it starts"""
+    # Imported here because the pipeline's LLM stage lives in this module
+    from app.services.resume_pipeline import resume_pipeline
+
+    # Repeat uploads of the same file are answered from the cache without extraction or an LLM call
+    cache_key = resume_cache_key(upload.sha256)
+    cached = await asyncio.to_thread(resume_cache.get, cache_key)
+    if cached is not None:
+        return cached["result"]
+
+    document = await resume_pipeline.run(upload, progress=progress)
+    if "llm" in document.degraded:
+        # Without the LLM the name and experience would be guesses; let the client retry instead
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Resume enrichment is unavailable, please retry",
+            headers={"Retry-After": "5"}
+        )
+    # Only complete parses are cached; one missing the LLM (skipped by config) is retried next time
+    if document.llm is not None and not document.degraded:
+        await asyncio.to_thread(resume_cache.put, cache_key, document.text, document.result, upload.size)
+    return document.result
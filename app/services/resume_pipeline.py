@@ -0,0 +1,189 @@
+from fastapi import HTTPException, status
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from app.services.metrics import metrics
+from app.services.parse_pool import parse_pool
+from app.services.pdf_extract import extract_pdf_text_parallel
+from app.services.docx_extract import extract_docx_text
+from app.services.resume_sections import segment_sections, extract_contact
+from app.services.resume_entities import heuristic_entities
+from app.services.skill_matcher import display_name
+from app.services.resume_parser import ResumeData, enrich_with_llm
+from app.services.uploads import StoredUpload
+import asyncio
+import os
+import time
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+STAGES = ("extract", "segment", "entities", "llm", "normalize")
+# Without these there is nothing to return, so they are never skipped and their failures are the request's
+REQUIRED_STAGES = ("extract", "normalize")
+
+# Comma-separated stages to turn off, e.g. "llm" to shed the LLM call under load
+RESUME_PIPELINE_SKIP = frozenset(
+    stage.strip() for stage in os.getenv("RESUME_PIPELINE_SKIP", "").split(",") if stage.strip()
+)
+RESUME_PDF_ENGINE = os.getenv("RESUME_PDF_ENGINE", "pypdf")
+STAGE_DEADLINES: Dict[str, float] = {
+    stage: float(os.getenv(f"RESUME_STAGE_{stage.upper()}_SECONDS", default))
+    for stage, default in (("extract", "30"), ("segment", "5"), ("entities", "30"), ("llm", "45"), ("normalize", "5"))
+}
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+class ResumeDocument:
+    """Everything known about one resume as it moves through the pipeline stages."""
+
+    def __init__(self, upload: StoredUpload):
+        self.upload = upload
+        self.text = ""
+        self.sections: Dict[str, str] = {}
+        self.contact: Optional[Dict[str, Optional[str]]] = None
+        self.entities: Dict[str, Any] = {}
+        self.llm: Optional[Dict[str, Any]] = None
+        self.result: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self.skipped: List[str] = []
+        # Optional stages that failed or ran out of time; results built without them are not cached
+        self.degraded: List[str] = []
+        # Deadline of the stage now running; parse pool jobs get it as their timeout so a
+        # job outliving its stage is killed rather than left holding a worker
+        self.stage_timeout: Optional[float] = None
+
+    @property
+    def skills(self) -> List[str]:
+        """Display names of the skills the matcher found, across every category, without repeats."""
+        names = [display_name(skill) for skills in self.entities.get("skills", {}).values() for skill in skills]
+        return list(dict.fromkeys(names))
+
+async def extract_stage(document: ResumeDocument, pdf_engine: str = RESUME_PDF_ENGINE):
+    upload = document.upload
+    if upload.extension not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported file type: {upload.extension or upload.content_type}"
+        )
+    try:
+        if upload.extension == ".pdf":
+            # Long PDFs are split by page range across the pool's workers
+            document.text = await extract_pdf_text_parallel(upload.path, engine=pdf_engine, timeout=document.stage_timeout)
+        else:
+            document.text = await parse_pool.run(extract_docx_text, upload.path, timeout=document.stage_timeout)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error extracting text from {upload.extension}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not extract text from {upload.extension.lstrip('.').upper()} file"
+        )
+
+async def segment_stage(document: ResumeDocument):
+    document.sections = segment_sections(document.text)
+    document.contact = extract_contact(document.text)
+
+async def entities_stage(document: ResumeDocument):
+    document.entities = await parse_pool.run(heuristic_entities, document.text, document.contact, timeout=document.stage_timeout)
+
+async def llm_stage(document: ResumeDocument):
+    # Without segmentation the whole text is sent, cut to the token budget
+    document.llm = await enrich_with_llm(document.text, document.sections)
+
+async def normalize_stage(document: ResumeDocument):
+    """Fill the ResumeData shape from the LLM's fields where it ran; contact details and skills come from the heuristics.
+
+    The heuristic education/experience matches are text snippets, not ResumeData
+    entries, so without the LLM those fields are left empty.
+    """
+    personal = document.entities.get("personal_info", {})
+    contact = document.contact or {}
+    llm = document.llm or {}
+    document.result = ResumeData(
+        full_name=llm.get("full_name") or personal.get("name") or document.text.split("\n")[0].strip(),
+        email=contact.get("email") or personal.get("email") or "",
+        phone=contact.get("phone") or personal.get("phone") or None,
+        skills=document.skills,
+        experience=llm.get("experience") or [],
+        education=llm.get("education"),
+        summary=llm.get("summary"),
+        years_of_experience=llm.get("years_of_experience")
+    ).dict()
+
+STAGE_FUNCTIONS: Dict[str, Callable[[ResumeDocument], Awaitable[None]]] = {
+    "segment": segment_stage,
+    "entities": entities_stage,
+    "llm": llm_stage,
+    "normalize": normalize_stage,
+}
+
+class ResumePipeline:
+    """Resume parsing as explicit stages over one shared ResumeDocument.
+
+    extract -> segment -> entities (regex, skill matcher, spaCy NER) -> llm -> normalize.
+    Stages in `skip` do not run; each stage is bounded by its deadline, and an optional
+    stage that fails or times out is recorded in `document.degraded` while the rest of
+    the pipeline carries on. Stage durations go to `resume_pipeline.<stage>_seconds`.
+    """
+
+    def __init__(self, skip: Iterable[str] = RESUME_PIPELINE_SKIP, deadlines: Optional[Dict[str, float]] = None):
+        unknown = set(skip) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown resume pipeline stages: {', '.join(sorted(unknown))}")
+        self.skip = frozenset(skip) - set(REQUIRED_STAGES)
+        self.deadlines = {**STAGE_DEADLINES, **(deadlines or {})}
+
+    async def _run_stage(self, stage: str, document: ResumeDocument, run: Callable[[], Awaitable[None]]):
+        started = time.perf_counter()
+        document.stage_timeout = self.deadlines[stage]
+        try:
+            await asyncio.wait_for(run(), self.deadlines[stage])
+        except asyncio.TimeoutError:
+            metrics.increment(f"resume_pipeline.{stage}.timeouts")
+            if stage in REQUIRED_STAGES:
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    detail=f"Resume {stage} took longer than {self.deadlines[stage]:g}s"
+                )
+            logger.warning(f"Resume pipeline stage {stage} timed out; continuing without it")
+            document.degraded.append(stage)
+        except Exception as e:
+            if stage in REQUIRED_STAGES:
+                raise
+            metrics.increment(f"resume_pipeline.{stage}.failures")
+            logger.error(f"Resume pipeline stage {stage} failed; continuing without it: {str(e)}")
+            document.degraded.append(stage)
+        finally:
+            elapsed = time.perf_counter() - started
+            document.timings[stage] = elapsed
+            metrics.observe(f"resume_pipeline.{stage}_seconds", elapsed)
+
+    async def run(
+        self,
+        upload: StoredUpload,
+        skip: Iterable[str] = (),
+        pdf_engine: str = RESUME_PDF_ENGINE,
+        progress: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> ResumeDocument:
+        """Run every stage not skipped (here or in config); `progress` is awaited with each stage name as it starts."""
+        skipped = self.skip | (frozenset(skip) - set(REQUIRED_STAGES))
+        document = ResumeDocument(upload)
+        started = time.perf_counter()
+        for stage in STAGES:
+            if stage in skipped:
+                document.skipped.append(stage)
+                metrics.increment(f"resume_pipeline.{stage}.skipped")
+                continue
+            if progress is not None:
+                await progress(stage)
+            if stage == "extract":
+                await self._run_stage(stage, document, lambda: extract_stage(document, pdf_engine))
+            else:
+                await self._run_stage(stage, document, lambda stage=stage: STAGE_FUNCTIONS[stage](document))
+        metrics.observe("resume_pipeline.total_seconds", time.perf_counter() - started)
+        return document
+
+# Shared per-process pipeline configured from the environment
+resume_pipeline = ResumePipeline()
@@ -0,0 +1,112 @@
+from typing import Dict, List, Optional, Tuple
+import os
+import re
+
+# Rough budget for resume text sent to the LLM; prompt and format instructions come on top
+RESUME_LLM_TOKEN_BUDGET = int(os.getenv("RESUME_LLM_TOKEN_BUDGET", "3000"))
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b')
+
+SECTIONS = ("contact", "summary", "experience", "education", "skills", "other")
+
+# Normalized heading text -> section
+SECTION_HEADINGS: Dict[str, str] = {
+    **{heading: "summary" for heading in (
+        "summary", "professional summary", "career summary", "profile", "professional profile",
+        "objective", "career objective", "about", "about me"
+    )},
+    **{heading: "experience" for heading in (
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "career history", "relevant experience"
+    )},
+    **{heading: "education" for heading in (
+        "education", "academic background", "academics", "qualifications", "education and training"
+    )},
+    **{heading: "skills" for heading in (
+        "skills", "technical skills", "key skills", "core skills", "core competencies", "competencies",
+        "technologies", "tech stack", "expertise", "areas of expertise", "tools"
+    )},
+    **{heading: "other" for heading in (
+        "projects", "personal projects", "certifications", "certificates", "awards", "achievements",
+        "publications", "languages", "interests", "hobbies", "references", "volunteering"
+    )},
+}
+
+# What the LLM still has to read, most important first; skills and contact details are found locally
+LLM_SECTIONS = ("contact", "summary", "experience", "education")
+
+MAX_HEADING_WORDS = 5
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+def _heading_section(line: str) -> Optional[str]:
+    stripped = line.strip()
+    if not stripped or len(stripped.split()) > MAX_HEADING_WORDS:
+        return None
+    normalized = re.sub(r"[^a-z& ]+", " ", stripped.lower()).replace("&", "and")
+    return SECTION_HEADINGS.get(" ".join(normalized.split()))
+
+def segment_sections(text: str) -> Dict[str, str]:
+    """Split resume text into sections by their headings.
+
+    Text before the first heading is the contact block. Repeated headings for the
+    same section are concatenated; sections that never appear are empty strings.
+    """
+    sections: Dict[str, List[str]] = {section: [] for section in SECTIONS}
+    current = "contact"
+    for line in text.splitlines():
+        section = _heading_section(line)
+        if section is not None:
+            current = section
+            continue
+        sections[current].append(line)
+    return {section: "\n".join(lines).strip() for section, lines in sections.items()}
+
+def extract_contact(text: str) -> Dict[str, Optional[str]]:
+    """Email and phone number found by regex."""
+    email = EMAIL_PATTERN.search(text)
+    phone = PHONE_PATTERN.search(text)
+    return {
+        "email": email.group(0) if email else None,
+        "phone": phone.group(0) if phone else None
+    }
+
+def _truncate(text: str, max_tokens: int) -> str:
+    # Cut at a line boundary so the LLM never sees half a bullet
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+def build_llm_input(text: str, sections: Dict[str, str], budget: int = RESUME_LLM_TOKEN_BUDGET) -> Tuple[str, bool]:
+    """Text for the LLM: the sections it still needs, highest priority first, within `budget` tokens.
+
+    Falls back to the (truncated) full text when no headings were recognised (or
+    `sections` is empty because segmentation did not run).
+    Returns the text and whether anything had to be cut.
+    """
+    if not any(sections.get(section) for section in SECTIONS if section != "contact"):
+        trimmed = _truncate(text, budget)
+        return trimmed, len(trimmed) < len(text)
+
+    parts = []
+    remaining = budget
+    truncated = False
+    for section in LLM_SECTIONS:
+        body = sections[section]
+        if not body:
+            continue
+        block = body if section == "contact" else f"{section.upper()}\n{body}"
+        if estimate_tokens(block) > remaining:
+            block = _truncate(block, remaining)
+            truncated = True
+        if block:
+            parts.append(block)
+            remaining -= estimate_tokens(block)
+        if remaining <= 0:
+            break
+    return "\n\n".join(parts), truncated
@@ -0,0 +1,204 @@
+from array import array
+from collections import Counter
+from datetime import date, datetime, timedelta
+from supabase import create_client, Client
+from typing import Dict, Any, List, Optional, Tuple, Iterable
+import os
+import threading
+from dotenv import load_dotenv
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Initialize Supabase client
+supabase: Client = create_client(
+    os.getenv("SUPABASE_URL"),
+    os.getenv("SUPABASE_KEY")
+)
+
+ROLLUP_COMPACT_SECONDS = int(os.getenv("ROLLUP_COMPACT_SECONDS", "3600"))
+GRANULARITIES = ("day", "week", "month")
+# Longest from..to span answered per granularity, so one request cannot build millions of buckets
+TIMESERIES_MAX_DAYS = {"day": 366, "week": 5 * 366, "month": 10 * 366}
+TOP_SKILLS_PER_BUCKET = 10
+
+def _bucket_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+class DailyRollup:
+    """Per-day counters stored column-wise: one array('q') per series, indexed by day.
+
+    Writes land in a small pending delta map so they stay O(1); compact() folds the
+    deltas into the arrays. Range queries sum array slices plus any pending deltas.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._origin: Optional[int] = None  # date ordinal of index 0 in every column
+        self._length = 0
+        self._columns: Dict[str, array] = {}
+        self._pending: Counter = Counter()
+
+    def record(self, series: str, day: Optional[date] = None, amount: int = 1):
+        day = day or datetime.utcnow().date()
+        with self._lock:
+            self._pending[(series, day.toordinal())] += amount
+
+    def _ensure_range(self, first: int, last: int):
+        # Grow every column so that ordinals first..last are addressable
+        if self._origin is None:
+            self._origin, self._length = first, 0
+        if first < self._origin:
+            padding = self._origin - first
+            for series, column in self._columns.items():
+                self._columns[series] = array("q", bytes(8 * padding)) + column
+            self._origin = first
+            self._length += padding
+        needed = last - self._origin + 1
+        if needed > self._length:
+            growth = array("q", bytes(8 * (needed - self._length)))
+            for column in self._columns.values():
+                column.extend(growth)
+            self._length = needed
+
+    def _apply(self, deltas: Dict[Tuple[str, int], int]):
+        if not deltas:
+            return
+        ordinals = [ordinal for _, ordinal in deltas]
+        self._ensure_range(min(ordinals), max(ordinals))
+        for (series, ordinal), amount in deltas.items():
+            column = self._columns.get(series)
+            if column is None:
+                column = self._columns[series] = array("q", bytes(8 * self._length))
+            column[ordinal - self._origin] += amount
+
+    def compact(self):
+        """Fold pending deltas into the columns and drop series that are all zero."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._apply(pending)
+            for series in [s for s, column in self._columns.items() if not any(column)]:
+                del self._columns[series]
+
+    def load(self, rows: Iterable[Tuple[date, str, int]]):
+        """Replace all columns with (day, series, count) rows."""
+        with self._lock:
+            self._origin, self._length, self._columns = None, 0, {}
+            self._apply({(series, day.toordinal()): count for day, series, count in rows})
+
+    def query(self, start: date, end: date, granularity: str = "day", prefix: str = "") -> List[Tuple[date, Dict[str, int]]]:
+        """Sum every series under prefix into buckets covering start..end (inclusive)."""
+        if (end - start).days + 1 > TIMESERIES_MAX_DAYS[granularity]:
+            raise ValueError(f"Range longer than {TIMESERIES_MAX_DAYS[granularity]} days for {granularity} granularity")
+        buckets: List[Tuple[date, int, int]] = []
+        day = start
+        while day <= end:
+            bucket = _bucket_start(day, granularity)
+            if granularity == "week":
+                next_day = bucket + timedelta(days=7)
+            elif granularity == "month":
+                next_day = (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+            else:
+                next_day = bucket + timedelta(days=1)
+            buckets.append((bucket, max(day, start).toordinal(), min(next_day - timedelta(days=1), end).toordinal()))
+            day = next_day
+
+        with self._lock:
+            result = []
+            for bucket, first, last in buckets:
+                totals: Dict[str, int] = {}
+                if self._origin is not None:
+                    lo = max(first - self._origin, 0)
+                    hi = min(last - self._origin + 1, self._length)
+                    if lo < hi:
+                        for series, column in self._columns.items():
+                            if series.startswith(prefix):
+                                value = sum(column[lo:hi])
+                                if value:
+                                    totals[series] = value
+                for (series, ordinal), amount in self._pending.items():
+                    if first <= ordinal <= last and series.startswith(prefix):
+                        totals[series] = totals.get(series, 0) + amount
+                result.append((bucket, totals))
+            return result
+
+# Shared per-process rollups
+rollups = DailyRollup()
+
+def record_candidate_created(row: Dict[str, Any]):
+    """Count a newly created candidate in the inflow rollups."""
+    rollups.record("candidates.created")
+    rollups.record(f"candidates.status.{row.get('status') or 'unknown'}")
+    for skill in set(row.get("skills") or []):
+        rollups.record(f"candidates.skill.{skill}")
+
+def record_candidate_updated(row: Dict[str, Any], previous: Dict[str, Any]):
+    """Move an updated candidate between status and skill series on its creation day.
+
+    The rebuild counts candidates by created_at and current status/skills, so an update
+    shifts counts within that day rather than adding to today.
+    """
+    created_at = row.get("created_at") or previous.get("created_at")
+    try:
+        day = datetime.fromisoformat(str(created_at).replace("Z", "+00:00")).date()
+    except ValueError:
+        day = None
+    old_status = previous.get("status") or "unknown"
+    new_status = row.get("status") or "unknown"
+    if old_status != new_status:
+        rollups.record(f"candidates.status.{old_status}", day, -1)
+        rollups.record(f"candidates.status.{new_status}", day)
+    old_skills = set(previous.get("skills") or [])
+    new_skills = set(row.get("skills") or [])
+    for skill in old_skills - new_skills:
+        rollups.record(f"candidates.skill.{skill}", day, -1)
+    for skill in new_skills - old_skills:
+        rollups.record(f"candidates.skill.{skill}", day)
+
+def record_outreach_status(row: Dict[str, Any], status: Optional[str] = None):
+    """Count an outreach message entering a status (every new message enters 'pending')."""
+    if status is None:
+        rollups.record("outreach.status.pending")
+        rollups.record(f"outreach.template.{row.get('template_id')}")
+        status = row.get("status") or "pending"
+        if status == "pending":
+            return
+    rollups.record(f"outreach.status.{status}")
+
+def rebuild_rollups() -> int:
+    """Backfill the rollups from per-day aggregates computed in the database."""
+    result = supabase.rpc("daily_rollup_series", {}).execute()
+    rows = [(date.fromisoformat(row["day"]), row["series"], row["count"]) for row in result.data or []]
+    rollups.load(rows)
+    logger.info(f"Rollups rebuilt from {len(rows)} daily series rows")
+    return len(rows)
+
+def _split(totals: Dict[str, int], prefix: str) -> Dict[str, int]:
+    return {series[len(prefix):]: value for series, value in totals.items() if series.startswith(prefix)}
+
+def get_timeseries(start: date, end: date, granularity: str = "day") -> List[Dict[str, Any]]:
+    """Outreach funnel and candidate inflow per bucket between start and end."""
+    series = []
+    for bucket, totals in rollups.query(start, end, granularity):
+        skills = _split(totals, "candidates.skill.")
+        series.append({
+            "start": bucket.isoformat(),
+            "outreach": {
+                "by_status": _split(totals, "outreach.status."),
+                "by_template": _split(totals, "outreach.template.")
+            },
+            "candidates": {
+                "created": totals.get("candidates.created", 0),
+                "by_status": _split(totals, "candidates.status."),
+                "top_skills": dict(Counter(skills).most_common(TOP_SKILLS_PER_BUCKET))
+            }
+        })
+    return series
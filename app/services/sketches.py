@@ -0,0 +1,198 @@
+from typing import Dict, List, Tuple, Any, Iterable
+import base64
+import hashlib
+import heapq
+import json
+import math
+import os
+import tempfile
+
+class SpaceSaving:
+    """Space-Saving top-k sketch (Metwally et al.) holding at most `capacity` counters.
+
+    Error bounds, with N the total weight added:
+    - a reported count overestimates the true count by at most its `error`, and error <= N / capacity;
+    - every item whose true count exceeds N / capacity is guaranteed to be tracked.
+    Memory is O(capacity) regardless of how many distinct items are seen.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def _push(self, item: str):
+        heapq.heappush(self._heap, (self.counts[item], item))
+        # Duplicate entries accumulate from discards; rebuild before the heap outgrows the counters
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> str:
+        # Heap entries are lazy lower bounds: increments do not touch the heap, so a
+        # popped entry whose count has since grown is pushed back with its real count
+        while True:
+            count, item = heapq.heappop(self._heap)
+            current = self.counts.get(item)
+            if current is None:
+                continue
+            if current == count:
+                return item
+            if current > count:
+                heapq.heappush(self._heap, (current, item))
+
+    def add(self, item: str, weight: int = 1):
+        self.total += weight
+        if item in self.counts:
+            self.counts[item] += weight
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[item] = weight
+            self.errors[item] = 0
+        else:
+            evicted = self._pop_min()
+            floor = self.counts.pop(evicted)
+            self.errors.pop(evicted)
+            self.counts[item] = floor + weight
+            self.errors[item] = floor
+        self._push(item)
+
+    @classmethod
+    def from_counts(cls, counts: Dict[str, int], capacity: int = 256) -> "SpaceSaving":
+        """Sketch of an exact aggregate: the `capacity` heaviest items with zero error.
+
+        Every untracked item counts no more than the smallest tracked one, which is
+        the invariant streaming updates rely on, and `total` covers all of `counts`.
+        """
+        sketch = cls(capacity)
+        for item, count in heapq.nlargest(capacity, counts.items(), key=lambda entry: entry[1]):
+            sketch.counts[item] = count
+            sketch.errors[item] = 0
+        sketch.total = sum(counts.values())
+        sketch._heap = [(count, item) for item, count in sketch.counts.items()]
+        heapq.heapify(sketch._heap)
+        return sketch
+
+    def discard(self, item: str, weight: int = 1):
+        """Best-effort decrement of a tracked item; untracked items are ignored."""
+        self.total = max(self.total - weight, 0)
+        if item in self.counts:
+            self.counts[item] = max(self.counts[item] - weight, 0)
+            self._push(item)
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        return heapq.nlargest(k, self.counts.items(), key=lambda entry: entry[1])
+
+    def min_count(self) -> int:
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Combine two sketches (mergeable summaries, Agarwal et al.); bounds add up."""
+        merged = SpaceSaving(max(self.capacity, other.capacity))
+        floor_self, floor_other = self.min_count(), other.min_count()
+        combined = {}
+        for item in set(self.counts) | set(other.counts):
+            count = self.counts.get(item, floor_self) + other.counts.get(item, floor_other)
+            error = self.errors.get(item, floor_self) + other.errors.get(item, floor_other)
+            combined[item] = (count, error)
+        for item, (count, error) in heapq.nlargest(merged.capacity, combined.items(), key=lambda entry: entry[1][0]):
+            merged.counts[item] = count
+            merged.errors[item] = error
+        merged.total = self.total + other.total
+        merged._heap = [(count, item) for item, count in merged.counts.items()]
+        heapq.heapify(merged._heap)
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "space_saving",
+            "capacity": self.capacity,
+            "total": self.total,
+            "counts": self.counts,
+            "errors": self.errors
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        sketch = cls(data["capacity"])
+        sketch.total = data["total"]
+        sketch.counts = dict(data["counts"])
+        sketch.errors = dict(data["errors"])
+        sketch._heap = [(count, item) for item, count in sketch.counts.items()]
+        heapq.heapify(sketch._heap)
+        return sketch
+
+class HyperLogLog:
+    """HyperLogLog distinct counter (Flajolet et al.) with 2**precision one-byte registers.
+
+    The relative standard error is about 1.04 / sqrt(2**precision): ~0.81% at the
+    default precision of 14, using 16 KiB. Merging takes the register-wise max, so
+    merging the same sketch twice is harmless.
+    """
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        merged = HyperLogLog(self.precision)
+        merged.registers = bytearray(map(max, self.registers, other.registers))
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "hyperloglog",
+            "precision": self.precision,
+            "registers": base64.b64encode(bytes(self.registers)).decode("ascii")
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(data["precision"])
+        sketch.registers = bytearray(base64.b64decode(data["registers"]))
+        return sketch
+
+def save_sketches(path: str, sketches: Dict[str, Any]):
+    """Atomically write named sketches to a JSON file."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as f:
+        json.dump({name: sketch.to_dict() for name, sketch in sketches.items()}, f)
+    os.replace(f.name, path)
+
+def load_sketches(path: str) -> Dict[str, Any]:
+    """Read named sketches written by save_sketches."""
+    with open(path) as f:
+        data = json.load(f)
+    loaders = {"space_saving": SpaceSaving.from_dict, "hyperloglog": HyperLogLog.from_dict}
+    return {name: loaders[entry["type"]](entry) for name, entry in data.items()}
+
+def merge_all(sketches: Iterable[Any]) -> Any:
+    """Merge an iterable of same-typed sketches into one."""
+    merged = None
+    for sketch in sketches:
+        merged = sketch if merged is None else merged.merge(sketch)
+    return merged
@@ -0,0 +1,243 @@
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Skill categories, canonical skill names and the aliases that count as a mention
+SKILL_CATEGORIES: Dict[str, Dict[str, List[str]]] = {
+    "programming": {
+        "python": ["python", "python programming", "python3", "python 3", "py", "django", "flask", "fastapi"],
+        "java": ["java", "java programming", "j2ee", "spring", "hibernate", "maven"],
+        "javascript": ["javascript", "js", "node.js", "nodejs", "react", "angular", "vue", "typescript", "ts"],
+        "c++": ["c++", "cpp", "c plus plus", "stl", "boost"],
+        "c#": ["c#", "csharp", "dotnet", ".net", "asp.net"],
+        "ruby": ["ruby", "ruby on rails", "rails", "ror"],
+        "php": ["php", "laravel", "symfony", "wordpress"],
+        "swift": ["swift", "ios development", "xcode"],
+        "kotlin": ["kotlin", "android development"],
+        "go": ["go", "golang"],
+        "rust": ["rust", "rust programming"],
+        "css": ["css", "css3", "css3"],
+        "html": ["html", "html5", "html5"],
+    },
+    "frameworks": {
+        "react": ["react", "react.js", "reactjs", "redux", "next.js"],
+        "angular": ["angular", "angularjs", "ng"],
+        "vue": ["vue", "vue.js", "vuejs", "nuxt"],
+        "django": ["django", "django framework"],
+        "flask": ["flask", "flask framework"],
+        "spring": ["spring", "spring boot", "spring framework"],
+        "express": ["express", "express.js", "expressjs"],
+        "node": ["node", "node.js", "nodejs", "express"],
+        "laravel": ["laravel"],
+        "silverstripe": ["silverstripe"],
+        "rails": ["rails", "ruby on rails", "ror"]
+    },
+    "databases": {
+        "mysql": ["mysql", "mariadb"],
+        "postgresql": ["postgresql", "postgres", "pg"],
+        "mongodb": ["mongodb", "mongo", "nosql"],
+        "redis": ["redis", "redis cache"],
+        "cassandra": ["cassandra", "apache cassandra"],
+        "elasticsearch": ["elasticsearch", "elastic", "elk stack"],
+        "dynamodb": ["dynamodb", "aws dynamodb"],
+        "sql": ["sql", "t-sql", "pl/sql"]
+    },
+    "cloud": {
+        "aws": ["aws", "amazon web services", "ec2", "s3", "lambda", "cloudfront"],
+        "azure": ["azure", "microsoft azure", "azure cloud"],
+        "gcp": ["gcp", "google cloud", "google cloud platform"],
+        "kubernetes": ["kubernetes", "k8s", "kubectl"],
+        "docker": ["docker", "docker compose", "containerization"],
+        "terraform": ["terraform", "iac", "infrastructure as code"]
+    },
+    "tools": {
+        "git": ["git", "github", "gitlab", "bitbucket"],
+        "jenkins": ["jenkins", "ci/cd", "continuous integration"],
+        "jira": ["jira", "atlassian", "agile tools"],
+        "confluence": ["confluence", "documentation"],
+        "slack": ["slack", "team collaboration"],
+        "agile": ["agile", "scrum", "kanban", "sprint"]
+    },
+    "ai_ml": {
+        "machine_learning": ["machine learning", "ml", "supervised learning", "unsupervised learning"],
+        "deep_learning": ["deep learning", "neural networks", "cnn", "rnn", "lstm"],
+        "tensorflow": ["tensorflow", "tf", "keras"],
+        "pytorch": ["pytorch", "torch"],
+        "scikit": ["scikit-learn", "sklearn", "scikit"],
+        "nlp": ["nlp", "natural language processing", "text mining"],
+        "computer_vision": ["computer vision", "cv", "image processing", "opencv"],
+        "data_science": ["data science", "data scientist"],
+        "ai": ["ai", "artificial intelligence"]
+    },
+    "data": {
+        "big_data": ["big data"],
+        "spark": ["spark", "apache spark", "pyspark"],
+        "hadoop": ["hadoop", "hdfs", "mapreduce"]
+    },
+    "payment_gateways": {
+        "stripe": ["stripe", "stripe payment"],
+        "paypal": ["paypal", "paypal payment"],
+        "razorpay": ["razorpay", "razorpay payment"],
+        "authorizenet": ["authorizenet", "authorizenet payment", "authorize.net", "authorize.net payment"],
+    }
+}
+
+# Names shown in parsed resumes where the canonical key is not already one (other keys: "_" -> " ")
+SKILL_DISPLAY_NAMES: Dict[str, str] = {
+    "scikit": "scikit-learn",
+    "node": "node.js",
+}
+
+def display_name(skill: str) -> str:
+    """Human-readable name for a canonical skill key, e.g. machine_learning -> machine learning."""
+    return SKILL_DISPLAY_NAMES.get(skill, skill.replace("_", " "))
+
+# Phrases near a mention that mark it as a real skill rather than a passing word
+POSITIVE_INDICATORS = [
+    "proficient", "experienced", "expert", "skilled",
+    "knowledge", "familiar", "worked with", "using",
+    "developed", "implemented", "created", "built",
+    "skills", "technologies", "stack", "tools",
+    "particulars", "expertise", "proficient in",
+    "experienced with", "familiar with",
+    # a comma suggests the mention is part of a list
+    ","
+]
+
+# Characters of context considered on each side of a mention
+CONTEXT_WINDOW = 50
+
+def _is_word(ch: str) -> bool:
+    # Same characters as the regex \w class
+    return ch.isalnum() or ch == "_"
+
+class AhoCorasick:
+    """Multi-pattern substring matcher built once, then run in a single pass per text.
+
+    Failure links are folded into a full transition table, so each character costs
+    one dict lookup. Matches are reported for every pattern, overlaps included.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                if ch not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].append(index)
+
+        # Breadth-first: resolve each state's transitions from its failure state's
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            delta[state] = dict(delta[fail[state]])
+            delta[state].update(goto[state])
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, pattern index) for every occurrence, in order of end."""
+        delta = self._delta
+        outputs = self._outputs
+        patterns = self.patterns
+        state = 0
+        for position, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                end = position + 1
+                for index in outputs[state]:
+                    yield end - len(patterns[index]), end, index
+
+class SkillMatcher:
+    """Finds taxonomy skills mentioned in a positive context with one automaton pass.
+
+    A skill counts when one of its aliases appears as a whole word (regex \\b rules)
+    and a positive indicator or a comma lies within CONTEXT_WINDOW characters of it.
+    """
+
+    def __init__(self, categories: Dict[str, Dict[str, List[str]]] = SKILL_CATEGORIES, indicators: List[str] = POSITIVE_INDICATORS):
+        self.categories = categories
+        patterns: List[str] = []
+        pattern_ids: Dict[str, int] = {}
+        for skills in categories.values():
+            for variations in skills.values():
+                for variation in variations:
+                    pattern_ids.setdefault(variation, len(patterns))
+                    if pattern_ids[variation] == len(patterns):
+                        patterns.append(variation)
+        self.alias_count = len(patterns)
+        self.indicator_ids = set()
+        for indicator in indicators:
+            if indicator not in pattern_ids:
+                pattern_ids[indicator] = len(patterns)
+                patterns.append(indicator)
+            self.indicator_ids.add(pattern_ids[indicator])
+        self.pattern_ids = pattern_ids
+        self.automaton = AhoCorasick(patterns)
+
+    def _scan(self, text: str) -> Tuple[Dict[int, List[Tuple[int, int]]], List[int], List[int]]:
+        aliases: Dict[int, List[Tuple[int, int]]] = {}
+        indicators: List[Tuple[int, int]] = []
+        for start, end, index in self.automaton.iter_matches(text):
+            if index < self.alias_count:
+                aliases.setdefault(index, []).append((start, end))
+            if index in self.indicator_ids:
+                indicators.append((start, end))
+        indicators.sort()
+        return aliases, [start for start, _ in indicators], [end for _, end in indicators]
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Return {category: [skill, ...]} in taxonomy order."""
+        text_lower = text.lower()
+        length = len(text_lower)
+        aliases, indicator_starts, indicator_ends = self._scan(text_lower)
+
+        def in_positive_context(start: int, end: int) -> bool:
+            window_start = max(0, start - CONTEXT_WINDOW)
+            window_end = min(length, end + CONTEXT_WINDOW)
+            i = bisect_left(indicator_starts, window_start)
+            while i < len(indicator_starts) and indicator_starts[i] < window_end:
+                if indicator_ends[i] <= window_end:
+                    return True
+                i += 1
+            return False
+
+        accepted = set()
+        for index, occurrences in aliases.items():
+            alias = self.automaton.patterns[index]
+            first_is_word = _is_word(alias[0])
+            last_is_word = _is_word(alias[-1])
+            # Like re.finditer, an alias's own matches never overlap each other
+            last_end = 0
+            for start, end in occurrences:
+                if start < last_end:
+                    continue
+                if (start > 0 and _is_word(text_lower[start - 1])) == first_is_word:
+                    continue
+                if (end < length and _is_word(text_lower[end])) == last_is_word:
+                    continue
+                last_end = end
+                if in_positive_context(start, end):
+                    accepted.add(index)
+                    break
+
+        found_skills = {category: [] for category in self.categories}
+        for category, skills in self.categories.items():
+            for skill, variations in skills.items():
+                if any(self.pattern_ids[variation] in accepted for variation in variations):
+                    found_skills[category].append(skill)
+        return found_skills
+
+# Built once at import
+skill_matcher = SkillMatcher()
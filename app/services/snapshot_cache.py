@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, Optional
+from app.services.metrics import metrics
+import asyncio
+import time
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+class SnapshotCache:
+    """Stale-while-revalidate cache around an expensive, blocking payload loader.
+
+    - younger than soft_ttl: served as is;
+    - between soft_ttl and hard_ttl: served as is while one background task refreshes it;
+    - older than hard_ttl (or missing): callers wait for a single shared refresh.
+    Every payload is stamped with `generated_at`.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Dict[str, Any]], soft_ttl: float, hard_ttl: float):
+        self.name = name
+        self.loader = loader
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.payload: Optional[Dict[str, Any]] = None
+        self.generated_at = 0.0
+        self._lock = asyncio.Lock()
+        self._background: Optional[asyncio.Task] = None
+
+    def age(self) -> float:
+        return time.time() - self.generated_at if self.payload is not None else float("inf")
+
+    async def _refresh(self):
+        started = time.perf_counter()
+        payload = dict(await asyncio.to_thread(self.loader))
+        metrics.observe(f"{self.name}.refresh_seconds", time.perf_counter() - started)
+        self.generated_at = time.time()
+        payload["generated_at"] = datetime.fromtimestamp(self.generated_at, timezone.utc).isoformat()
+        self.payload = payload
+
+    async def _refresh_once(self, max_age: float):
+        # Single flight: whoever waited on the lock re-checks before loading again
+        async with self._lock:
+            if self.age() >= max_age:
+                await self._refresh()
+
+    async def _refresh_in_background(self):
+        try:
+            await self._refresh_once(self.soft_ttl)
+        except Exception as e:
+            metrics.increment(f"{self.name}.refresh_errors")
+            logger.error(f"Background refresh of {self.name} failed: {str(e)}")
+
+    async def get(self) -> Dict[str, Any]:
+        if self.age() >= self.hard_ttl:
+            await self._refresh_once(self.hard_ttl)
+        elif self.age() >= self.soft_ttl and (self._background is None or self._background.done()):
+            self._background = asyncio.create_task(self._refresh_in_background())
+        metrics.set_gauge(f"{self.name}.snapshot_age_seconds", round(self.age(), 3))
+        return self.payload
+
+    def invalidate(self):
+        """Force the next read to refresh synchronously."""
+        self.payload = None
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Tuple
+import re
+import threading
+
+PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+TEMPLATE_CACHE_SIZE = 256
+
+Candidate = Dict[str, Any]
+
+def _first_name(candidate: Candidate) -> str:
+    parts = (candidate.get("full_name") or "").split()
+    return parts[0] if parts else ""
+
+def _field(name: str) -> Callable[[Candidate], str]:
+    return lambda candidate: str(candidate.get(name) or "")
+
+# Placeholders a template body or subject may use
+PLACEHOLDERS: Dict[str, Callable[[Candidate], str]] = {
+    "candidate_name": _field("full_name"),
+    "full_name": _field("full_name"),
+    "first_name": _first_name,
+    "email": _field("email"),
+    "location": _field("location"),
+    "current_position": _field("current_position"),
+    "desired_position": _field("desired_position"),
+    "skills": lambda candidate: ", ".join(candidate.get("skills") or []),
+}
+
+def compile_text(text: Optional[str]) -> Callable[[Candidate], Optional[str]]:
+    """Compile a template string into a render function.
+
+    The text is split once into literal chunks and placeholder resolvers, so rendering
+    is a single join. Unknown placeholders are left in the output untouched.
+    """
+    if text is None:
+        return lambda candidate: None
+
+    pieces = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        resolver = PLACEHOLDERS.get(match.group(1))
+        if resolver is None:
+            continue
+        pieces.append(text[position:match.start()])
+        pieces.append(resolver)
+        position = match.end()
+    pieces.append(text[position:])
+
+    if len(pieces) == 1:
+        return lambda candidate: text
+
+    literals = pieces[0::2]
+    resolvers = pieces[1::2]
+    tail = literals[-1]
+    pairs = tuple(zip(literals, resolvers))
+
+    def render(candidate: Candidate) -> str:
+        out = []
+        for literal, resolver in pairs:
+            out.append(literal)
+            out.append(resolver(candidate))
+        out.append(tail)
+        return "".join(out)
+
+    return render
+
+class CompiledTemplate:
+    """Render functions for an outreach template's subject and body."""
+
+    def __init__(self, template: Dict[str, Any]):
+        self.template_id = template.get("id")
+        self.subject = compile_text(template.get("subject"))
+        self.body = compile_text(template.get("body"))
+
+    def render(self, candidate: Candidate) -> Tuple[Optional[str], Optional[str]]:
+        return self.subject(candidate), self.body(candidate)
+
+_cache: "OrderedDict[Tuple[Any, Any], CompiledTemplate]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def get_compiled_template(template: Dict[str, Any]) -> CompiledTemplate:
+    """Compile a template once per (id, updated_at); edits produce a new cache key."""
+    key = (template.get("id"), template.get("updated_at"))
+    with _cache_lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            return compiled
+    compiled = CompiledTemplate(template)
+    with _cache_lock:
+        _cache[key] = compiled
+        while len(_cache) > TEMPLATE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
+
+def render_message(template: Dict[str, Any], candidate: Candidate) -> Tuple[Optional[str], Optional[str]]:
+    """Render (subject, body) of a template for one candidate."""
+    return get_compiled_template(template).render(candidate)
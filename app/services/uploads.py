@@ -0,0 +1,98 @@
+from fastapi import HTTPException, Request, UploadFile, status
+from typing import Optional
+from app.services.metrics import metrics
+import hashlib
+import os
+import tempfile
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+RESUME_MAX_UPLOAD_BYTES = int(os.getenv("RESUME_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 256 * 1024
+# Room for multipart boundaries and headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+SIZE_BUCKETS = (64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 10 * 1024 * 1024, 50 * 1024 * 1024)
+
+class StoredUpload:
+    """An upload spooled to a temp file: path, size and SHA-256, never the whole body in memory."""
+
+    def __init__(self, path: str, filename: str, content_type: Optional[str], size: int, sha256: str):
+        self.path = path
+        self.filename = filename
+        self.content_type = content_type
+        self.size = size
+        self.sha256 = sha256
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.filename or "")[1].lower()
+
+    def open(self):
+        return open(self.path, "rb")
+
+    def close(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "StoredUpload":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _too_large(max_bytes: int) -> HTTPException:
+    metrics.increment("uploads.rejected_too_large")
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=too_large_detail(max_bytes)
+    )
+
+def content_length_exceeds(request: Request, max_bytes: int = RESUME_MAX_UPLOAD_BYTES) -> bool:
+    """True when the declared Content-Length already rules the request out."""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        metrics.increment("uploads.rejected_too_large")
+        return True
+    return False
+
+def too_large_detail(max_bytes: int = RESUME_MAX_UPLOAD_BYTES) -> str:
+    return f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB"
+
+async def store_upload(file: UploadFile, max_bytes: int = RESUME_MAX_UPLOAD_BYTES) -> StoredUpload:
+    """Copy an upload to a temp file in fixed-size chunks, hashing as it goes.
+
+    Raises 413 as soon as more than `max_bytes` have been read and 400 for an empty
+    file; the temp file is removed in both cases. Callers own the returned upload
+    and should close it (or use it as a context manager) when done.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    handle = tempfile.NamedTemporaryFile(prefix="upload-", suffix=os.path.splitext(file.filename or "")[1].lower(), delete=False)
+    try:
+        with handle:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                hasher.update(chunk)
+                handle.write(chunk)
+        if size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Empty file received"
+            )
+    except BaseException:
+        os.remove(handle.name)
+        raise
+
+    metrics.observe("uploads.size_bytes", size, SIZE_BUCKETS)
+    logger.debug(f"Stored upload {file.filename} ({size} bytes) at {handle.name}")
+    return StoredUpload(handle.name, file.filename, file.content_type, size, hasher.hexdigest())
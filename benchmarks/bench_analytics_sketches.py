@@ -0,0 +1,58 @@
+"""Compare exact analytics counting with the Space-Saving / HyperLogLog sketches.
+
+Usage: python benchmarks/bench_analytics_sketches.py [n_candidates]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+# Add the project root directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.sketches import SpaceSaving, HyperLogLog
+
+def generate_candidates(n: int):
+    random.seed(42)
+    for i in range(n):
+        # Zipf-like skill popularity over a long-tailed vocabulary
+        skills = {f"skill-{int(random.paretovariate(1.2))}" for _ in range(random.randint(3, 12))}
+        yield skills, f"city-{random.randint(0, n // 10)}"
+
+def measure(label: str, build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  peak {peak / 1024:9.1f} KiB")
+    return result
+
+def exact(candidates):
+    skills, locations = Counter(), set()
+    for candidate_skills, location in candidates:
+        skills.update(candidate_skills)
+        locations.add(location)
+    return skills.most_common(5), len(locations)
+
+def approximate(candidates):
+    skills, locations = SpaceSaving(256), HyperLogLog()
+    for candidate_skills, location in candidates:
+        for skill in candidate_skills:
+            skills.add(skill)
+        locations.add(location)
+    return skills.top(5), locations.count(), skills.total // skills.capacity
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    candidates = list(generate_candidates(n))
+    print(f"{n} candidates")
+    exact_top, exact_distinct = measure("exact (Counter + set)", lambda: exact(candidates))
+    approx_top, approx_distinct, bound = measure("sketch (SpaceSaving + HLL)", lambda: approximate(candidates))
+    print(f"top skills exact:  {exact_top}")
+    print(f"top skills sketch: {approx_top} (overcount bound {bound})")
+    print(f"distinct locations exact {exact_distinct}, sketch {approx_distinct} "
+          f"({abs(approx_distinct - exact_distinct) / max(exact_distinct, 1) * 100:.2f}% error)")
@@ -0,0 +1,58 @@
+"""Measure DOCX text extraction speed and peak memory: python-docx paragraphs vs. streaming the XML parts.
+
+Usage: python benchmarks/bench_docx_extract.py [paragraphs] [repeats]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add the project root directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from docx import Document
+from app.services.docx_extract import extract_docx_text
+
+def write_docx(path: Path, paragraphs: int):
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane.doe@example.com | San Francisco"
+    for index in range(paragraphs):
+        document.add_paragraph(f"Paragraph {index}: built data pipelines using Python, Kafka and PostgreSQL on AWS.")
+        if index % 50 == 0:
+            table = document.add_table(rows=3, cols=2)
+            for row, (label, value) in enumerate((("Skills", "Python, Go"), ("Tools", "Docker, Git"), ("Cloud", "AWS"))):
+                table.cell(row, 0).text = label
+                table.cell(row, 1).text = value
+    document.save(path)
+
+def python_docx_text(path: str) -> str:
+    # Baseline: the previous extract_text_from_docx
+    doc = Document(path)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+def measure(label, extract, path, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        text = extract(path)
+    elapsed = (time.perf_counter() - started) / repeats
+    tracemalloc.start()
+    extract(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<16} {elapsed * 1000:9.2f} ms/doc  peak {peak / (1024 * 1024):7.2f} MB  {len(text):8,} chars")
+
+def main():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    path = Path(tempfile.mkdtemp(prefix="bench-docx-")) / "resume.docx"
+    write_docx(path, paragraphs)
+    print(f"{paragraphs} paragraphs, {path.stat().st_size:,} bytes")
+    measure("python-docx", python_docx_text, str(path), repeats)
+    measure("streaming", extract_docx_text, str(path), repeats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Measure PDF extraction pages/sec: old per-page extract_tables() loop vs. adaptive and page-parallel extraction.
+
+Usage: python benchmarks/bench_pdf_extract.py [pages] [documents]
+
+Writes a synthetic corpus (text pages, with a ruled table on every fifth page)
+to a temp directory; no PDF library is needed to generate it.
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pdfplumber
+from app.services import pdf_extract
+from app.services.parse_pool import ParsePool
+
+WORDS = "python django fastapi postgresql redis docker kubernetes aws terraform react typescript".split()
+
+def _page_stream(number: int, with_table: bool) -> bytes:
+    lines = ["BT /F1 10 Tf 12 TL 50 760 Td"]
+    for row in range(40):
+        words = " ".join(WORDS[(number + row + i) % len(WORDS)] for i in range(9))
+        lines.append(f"(Page {number} line {row}: {words}) '")
+    lines.append("ET")
+    if with_table:
+        # A 4x3 grid of ruling lines with a word in each cell
+        lines.append("0.5 w")
+        for y in (60, 90, 120, 150):
+            lines.append(f"50 {y} m 410 {y} l S")
+        for x in (50, 170, 290, 410):
+            lines.append(f"{x} 60 m {x} 150 l S")
+        for row, y in enumerate((130, 100, 70)):
+            for col, x in enumerate((60, 180, 300)):
+                lines.append(f"BT /F1 10 Tf {x} {y} Td (cell {row}-{col} {WORDS[(row * 3 + col) % len(WORDS)]}) Tj ET")
+    return "\n".join(lines).encode("latin-1")
+
+def write_pdf(path: Path, pages: int, table_every: int = 5):
+    """Write a minimal valid PDF with `pages` pages of text."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for number in range(pages):
+        stream = _page_stream(number, table_every and number % table_every == table_every - 1)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+def old_extract(path: str) -> str:
+    # Baseline: services/resume.extract_text_from_pdf before the adaptive engine
+    text = ""
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+            tables = page.extract_tables()
+            for table in tables:
+                for row in table:
+                    text += " ".join([str(cell) for cell in row if cell]) + "\n"
+    return text.strip()
+
+def run(label, extract, paths, pages):
+    started = time.perf_counter()
+    outputs = [extract(path) for path in paths]
+    elapsed = time.perf_counter() - started
+    print(f"{label:<30} {pages * len(paths) / elapsed:10.1f} pages/sec")
+    return outputs
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    documents = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    workers = 4
+    directory = Path(tempfile.mkdtemp(prefix="bench-pdf-"))
+    paths = []
+    for index in range(documents):
+        path = directory / f"resume-{index}.pdf"
+        write_pdf(path, pages)
+        paths.append(str(path))
+    print(f"{documents} documents x {pages} pages")
+
+    baseline = run("extract_tables on every page", old_extract, paths, pages)
+    adaptive = run("adaptive tables", lambda path: pdf_extract.extract_pdf_text(path, max_pages=pages), paths, pages)
+    assert adaptive == baseline, "adaptive extraction changed the output"
+
+    pool = ParsePool(workers=workers, initializer=None)
+    pdf_extract.parse_pool = pool
+
+    async def parallel(path):
+        return await pdf_extract.extract_pdf_text_parallel(path, max_pages=pages)
+
+    async def run_parallel():
+        await pool.start()
+        started = time.perf_counter()
+        outputs = [await parallel(path) for path in paths]
+        elapsed = time.perf_counter() - started
+        print(f"{f'adaptive, {workers} workers':<30} {pages * len(paths) / elapsed:10.1f} pages/sec")
+        return outputs
+
+    try:
+        assert asyncio.run(run_parallel()) == baseline, "parallel extraction changed the output"
+    finally:
+        pool.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measure per-resume CPU time of services/resume: the rule-based extractors alone vs. the old four full spaCy passes.
+
+Usage: python benchmarks/bench_resume_nlp.py [n_resumes]
+
+Requires the en_core_web_sm model for the baseline.
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the project root directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The resume service creates a Supabase client at import; the benchmark never uses it
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench")
+
+import spacy
+from app.services.resume import (
+    analyze_text, analyze_texts, extract_skills, extract_education,
+    extract_experience, extract_personal_info
+)
+from app.services.parse_pool import parse_pool
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 415-555-0134 | San Francisco, California
+
+Summary
+Senior software engineer with 8 years of experience building data platforms and APIs.
+
+Skills
+Python, Django, FastAPI, PostgreSQL, Redis, Docker, Kubernetes, AWS, Terraform, React, TypeScript
+
+Experience
+Lead Backend Engineer, Acme Corp, Seattle (2019 - present)
+Developed and implemented event-driven services using Kafka and Python; built CI/CD with Jenkins.
+Software Engineer, Globex, Austin (2015 - 2019)
+Worked with Java, Spring Boot and MySQL; created internal tools for the analytics team.
+
+Education
+Bachelor of Science in Computer Science, University of Texas at Austin, 2015
+"""
+
+def old_analyze(full_nlp, text):
+    # Baseline: every extractor ran the full pipeline itself
+    full_nlp(text.lower())
+    skills = extract_skills(text)
+    full_nlp(text)
+    education = extract_education(text)
+    full_nlp(text)
+    experience = extract_experience(text)
+    full_nlp(text)
+    personal_info = extract_personal_info(text)
+    return skills, education, experience, personal_info
+
+def run(label, fn, texts):
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    fn(texts)
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    print(f"{label:<28} {cpu / len(texts) * 1000:8.2f} ms CPU/resume {wall / len(texts) * 1000:8.2f} ms wall/resume")
+
+def main():
+    n_resumes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    texts = [RESUME.replace("Jane", f"Jane{i}") for i in range(n_resumes)]
+
+    full_nlp = spacy.load("en_core_web_sm")
+    old_analyze(full_nlp, texts[0])
+    analyze_text(texts[0])
+
+    run("four full passes", lambda batch: [old_analyze(full_nlp, text) for text in batch], texts)
+    run("no spaCy pass", lambda batch: [analyze_text(text) for text in batch], texts)
+
+    async def pooled(batch):
+        await parse_pool.start()
+        try:
+            await analyze_texts(batch)
+        finally:
+            parse_pool.shutdown()
+    # CPU here is the parent's only; the workers' time shows up as wall time
+    run("parse pool batch", lambda batch: asyncio.run(pooled(batch)), texts)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Measure outreach renders/sec: compiled templates vs. re-parsing the template per message.
+
+Usage: python benchmarks/bench_template_render.py [n_messages]
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add the project root directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.templates import PLACEHOLDERS, PLACEHOLDER_PATTERN, render_message
+
+TEMPLATE = {
+    "id": "bench-template",
+    "updated_at": "2024-01-01T00:00:00+00:00",
+    "subject": "{first_name}, a {desired_position} role in {location}",
+    "body": (
+        "Hello {candidate_name},\n\n"
+        "I came across your profile and your work as {current_position} caught my eye. "
+        "Your experience with {skills} is exactly what our team in {location} is looking for.\n\n"
+        "Would you be open to a quick call this week?\n\nBest regards"
+    ) * 3
+}
+
+def naive_render(text, candidate):
+    # Baseline: scan the template with a regex for every message
+    return PLACEHOLDER_PATTERN.sub(
+        lambda match: PLACEHOLDERS[match.group(1)](candidate) if match.group(1) in PLACEHOLDERS else match.group(0),
+        text
+    )
+
+def run(label, render, candidates):
+    started = time.perf_counter()
+    for candidate in candidates:
+        render(candidate)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {len(candidates) / elapsed:12,.0f} renders/sec")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    candidates = [
+        {
+            "id": str(i),
+            "full_name": f"Candidate {i} Example",
+            "location": "Berlin",
+            "current_position": "Backend Engineer",
+            "desired_position": "Tech Lead",
+            "skills": ["python", "fastapi", "postgresql"]
+        }
+        for i in range(n)
+    ]
+    run("regex per message", lambda c: (naive_render(TEMPLATE["subject"], c), naive_render(TEMPLATE["body"], c)), candidates)
+    run("compiled (cached)", lambda c: render_message(TEMPLATE, c), candidates)
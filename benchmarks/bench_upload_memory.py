@@ -0,0 +1,57 @@
+"""Measure peak Python memory per upload: reading the whole file vs. streaming it to a temp file.
+
+Usage: python benchmarks/bench_upload_memory.py [size_mb]
+"""
+import asyncio
+import hashlib
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the project root directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import UploadFile
+from app.services.uploads import store_upload
+
+def make_upload(size: int) -> UploadFile:
+    # Starlette hands endpoints a spooled temp file much like this one
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    block = b"%PDF-1.4 benchmark payload " * 4096
+    written = 0
+    while written < size:
+        chunk = block[:size - written]
+        spooled.write(chunk)
+        written += len(chunk)
+    spooled.seek(0)
+    return UploadFile(file=spooled, filename="resume.pdf")
+
+async def read_whole(upload: UploadFile) -> str:
+    # Baseline: buffer the entire upload, then hash it
+    content = await upload.read()
+    return hashlib.sha256(content).hexdigest()
+
+async def stream_to_disk(upload: UploadFile) -> str:
+    stored = await store_upload(upload, max_bytes=1 << 40)
+    stored.close()
+    return stored.sha256
+
+def measure(label, fn, size):
+    upload = make_upload(size)
+    tracemalloc.start()
+    digest = asyncio.run(fn(upload))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    upload.file.close()
+    print(f"{label:<18} peak {peak / (1024 * 1024):8.2f} MB  sha256 {digest[:12]}")
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    size = size_mb * 1024 * 1024
+    print(f"{size_mb} MB upload")
+    measure("read whole file", read_whole, size)
+    measure("stream to disk", stream_to_disk, size)
+
+if __name__ == "__main__":
+    main()
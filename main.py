@@ -6,8 +6,19 @@ from supabase import create_client, Client
 from app.routes import auth, candidates, outreach, analytics, resumes, user_profile
 from app.services.auth import verify_token
 from app.services.resume import upload_resume
+from app.services.leaderboard import rebuild_leaderboards
+from app.services.analytics import reconcile_analytics, ANALYTICS_RECONCILE_SECONDS
+from app.services.rollups import rebuild_rollups, rollups, ROLLUP_COMPACT_SECONDS
+from app.services.metrics import metrics
+from app.services.delivery import DeliveryWorker, OUTREACH_DELIVERY_ENABLED
+from app.services.parse_pool import parse_pool
+from app.services.resume_jobs import resume_jobs
+from app.services.uploads import content_length_exceeds, too_large_detail
+from fastapi.responses import JSONResponse
 
 from typing import Dict, Any
+import asyncio
+import hmac
 import logging
 
 
@@ -29,6 +40,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Shared secret for metrics scrapers; unset means /api/metrics only accepts user tokens
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Upload routes whose request bodies are size-capped
+UPLOAD_PATHS = ("/api/resumes/upload",)
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    # Route handlers only run after the multipart body has been received, so refuse here
+    if request.url.path in UPLOAD_PATHS and content_length_exceeds(request):
+        return JSONResponse(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, content={"detail": too_large_detail()})
+    return await call_next(request)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(candidates.router, prefix="/api/candidates", tags=["candidates"])
@@ -37,10 +61,89 @@ app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"]
 app.include_router(resumes.router, prefix="/api/resumes", tags=["resumes"])
 app.include_router(user_profile.router, prefix="/api/profile", tags=["profile"])
 
+@app.on_event("startup")
+async def build_in_memory_indexes():
+    try:
+        rebuild_leaderboards()
+    except Exception as e:
+        # Leaderboard reads fall back to the database until a rebuild succeeds
+        logger.error(f"Failed to rebuild leaderboards: {str(e)}")
+
+    try:
+        rebuild_rollups()
+    except Exception as e:
+        # Timeseries only cover writes seen by this process until a rebuild succeeds
+        logger.error(f"Failed to rebuild rollups: {str(e)}")
+
+    # Kept on app.state so shutdown can cancel them
+    app.state.background_tasks = [
+        asyncio.create_task(reconcile_analytics_periodically()),
+        asyncio.create_task(compact_rollups_periodically())
+    ]
+
+    if OUTREACH_DELIVERY_ENABLED:
+        app.state.delivery_worker = DeliveryWorker()
+        app.state.delivery_worker.start()
+
+    # Spawn the resume parse workers (and load their spaCy models) in the background
+    app.state.background_tasks.append(asyncio.create_task(parse_pool.start()))
+
+    try:
+        # Picks up jobs a previous process accepted but never finished
+        await resume_jobs.start()
+    except Exception as e:
+        logger.error(f"Failed to start resume jobs: {str(e)}")
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    background_tasks = getattr(app.state, "background_tasks", [])
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    delivery_worker = getattr(app.state, "delivery_worker", None)
+    if delivery_worker is not None:
+        await delivery_worker.stop()
+    await resume_jobs.stop()
+    parse_pool.shutdown()
+
+async def reconcile_analytics_periodically():
+    # Correct drift in the incrementally maintained analytics counters
+    while True:
+        try:
+            await asyncio.to_thread(reconcile_analytics)
+        except Exception as e:
+            logger.error(f"Failed to reconcile analytics: {str(e)}")
+        await asyncio.sleep(ANALYTICS_RECONCILE_SECONDS)
+
+async def compact_rollups_periodically():
+    # Fold buffered rollup writes into the per-day columns
+    while True:
+        await asyncio.sleep(ROLLUP_COMPACT_SECONDS)
+        try:
+            rollups.compact()
+        except Exception as e:
+            logger.error(f"Failed to compact rollups: {str(e)}")
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/metrics")
+async def get_metrics(request: Request):
+    # Scrapers can use the shared METRICS_TOKEN; anyone else needs a valid user token
+    authorization = request.headers.get("Authorization") or ""
+    token = authorization[len("Bearer "):] if authorization.startswith("Bearer ") else ""
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    if not (METRICS_TOKEN and hmac.compare_digest(token.encode(), METRICS_TOKEN.encode())):
+        # verify_token calls Supabase over blocking HTTP
+        await asyncio.to_thread(verify_token, token)
+    return metrics.snapshot()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
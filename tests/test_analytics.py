@@ -40,6 +40,7 @@ def test_get_analytics(client, auth_headers, test_candidate, test_template):
     assert "status_distribution" in data
     assert "outreach_stats" in data
     assert "top_skills" in data
+    assert "generated_at" in data
     
     # Verify specific values
     assert data["total_candidates"] > 0
@@ -63,4 +64,79 @@ def test_get_analytics_no_data(client, auth_headers):
     assert data["status_distribution"] == {}
     assert data["outreach_stats"]["total_outreach"] == 0
     assert data["outreach_stats"]["successful_outreach"] == 0
-    assert data["top_skills"] == [] 
\ No newline at end of file
+    assert data["top_skills"] == [] 
+
+def test_get_analytics_timeseries(client, auth_headers):
+    response = client.get(
+        "/api/analytics/timeseries",
+        headers=auth_headers,
+        params={"from": "2024-01-01", "to": "2024-01-31", "granularity": "week"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["granularity"] == "week"
+    assert data["buckets"][0]["start"] == "2024-01-01"
+    assert all("outreach" in b and "candidates" in b for b in data["buckets"])
+
+def test_get_analytics_timeseries_invalid_granularity(client, auth_headers):
+    response = client.get(
+        "/api/analytics/timeseries",
+        headers=auth_headers,
+        params={"granularity": "hour"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_get_analytics_timeseries_rejects_long_ranges(client, auth_headers):
+    response = client.get(
+        "/api/analytics/timeseries",
+        headers=auth_headers,
+        params={"from": "1900-01-01", "to": "2024-01-31", "granularity": "day"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.fixture
+def candidate_snapshot(tmp_path, monkeypatch):
+    from app.routes import analytics as analytics_routes
+    from app.services import columnar
+
+    rows = [
+        {"id": "1", "experience_years": 2, "score": 10.0, "location": "Berlin", "status": "active", "skills": ["python"]},
+        {"id": "2", "experience_years": 7, "score": 20.0, "location": "Paris", "status": "active", "skills": ["python", "sql"]},
+        {"id": "3", "experience_years": 120, "score": 30.0, "location": None, "status": "hired", "skills": []},
+        {"id": "4", "experience_years": None, "score": None, "location": "Berlin", "status": None, "skills": None},
+    ]
+    monkeypatch.setattr(columnar, "iter_table_pages", lambda table, columns: iter([rows]))
+    columnar.export_candidate_snapshot(str(tmp_path))
+    monkeypatch.setattr(analytics_routes, "get_candidate_snapshot", lambda: columnar.get_candidate_snapshot(str(tmp_path)))
+
+def test_get_score_percentiles_report(client, auth_headers, candidate_snapshot):
+    response = client.get("/api/analytics/reports/score-percentiles", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["candidates"] == 4
+    assert data["scored"] == 3
+    assert data["percentiles"]["p50"] == 20.0
+
+def test_get_experience_report_clamps_outliers(client, auth_headers, candidate_snapshot):
+    response = client.get("/api/analytics/reports/experience", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert sum(bucket["count"] for bucket in data["buckets"]) == 3
+    assert data["buckets"][-1] == {"min": 30, "max": 100, "count": 1}
+    assert data["unknown"] == 1
+
+def test_approximate_reconcile_seeds_sketches_and_totals():
+    from app.services.analytics import AnalyticsAggregator
+    from app.services.sketches import HyperLogLog
+
+    aggregator = AnalyticsAggregator(approximate=True)
+    locations = HyperLogLog()
+    for city in ("berlin", "paris", "lisbon"):
+        locations.add(city)
+    skill_counts = {f"skill-{i}": 1000 - i for i in range(1000)}
+    aggregator.reconcile({"active": 10}, skill_counts, {"sent": 4}, {"locations": locations})
+
+    data = aggregator.snapshot()
+    assert aggregator.skill_counts.total == sum(skill_counts.values())
+    assert list(data["top_skills"]) == ["skill-0", "skill-1", "skill-2", "skill-3", "skill-4"]
+    assert data["distinct_counts"]["locations"] == 3
@@ -0,0 +1,57 @@
+import asyncio
+from app.services.batch_writer import GroupCommitWriter
+
+def _fake_write(calls, fail_on=None):
+    def write(rows):
+        calls.append([row["email"] for row in rows])
+        if len(rows) > 1 and any(row["email"] == fail_on for row in rows):
+            raise RuntimeError("bulk write rejected")
+        if any(row["email"] == fail_on for row in rows):
+            raise RuntimeError("bad row")
+        return [{"id": row["email"].split("@")[0], **row} for row in rows]
+    return write
+
+def test_concurrent_writes_share_one_flush(monkeypatch):
+    writer = GroupCommitWriter("candidates", on_conflict="email", window_ms=20, max_rows=100)
+    calls = []
+    monkeypatch.setattr(writer, "_write", _fake_write(calls))
+
+    async def run():
+        return await asyncio.gather(*(writer.submit({"email": f"user{i}@example.com"}) for i in range(5)))
+
+    rows = asyncio.run(run())
+    assert len(calls) == 1
+    assert [row["id"] for row in rows] == [f"user{i}" for i in range(5)]
+    assert writer._flushes == set()
+
+def test_duplicate_conflict_keys_flush_in_separate_rounds(monkeypatch):
+    writer = GroupCommitWriter("candidates", on_conflict="email", window_ms=20, max_rows=100)
+    calls = []
+    monkeypatch.setattr(writer, "_write", _fake_write(calls))
+
+    async def run():
+        return await asyncio.gather(
+            writer.submit({"email": "john@example.com", "full_name": "John"}),
+            writer.submit({"email": "john@example.com", "full_name": "Johnny"}),
+            writer.submit({"email": "jane@example.com"})
+        )
+
+    rows = asyncio.run(run())
+    assert calls == [["john@example.com", "jane@example.com"], ["john@example.com"]]
+    assert rows[1]["full_name"] == "Johnny"
+
+def test_failed_bulk_write_isolates_bad_row(monkeypatch):
+    writer = GroupCommitWriter("outreach_messages", window_ms=20, max_rows=100)
+    calls = []
+    monkeypatch.setattr(writer, "_write", _fake_write(calls, fail_on="bad@example.com"))
+
+    async def run():
+        return await asyncio.gather(
+            writer.submit({"email": "good@example.com"}),
+            writer.submit({"email": "bad@example.com"}),
+            return_exceptions=True
+        )
+
+    good, bad = asyncio.run(run())
+    assert good["id"] == "good"
+    assert isinstance(bad, RuntimeError)
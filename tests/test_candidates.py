@@ -91,4 +91,92 @@ def test_delete_candidate(client, auth_headers, test_candidate):
     
     # Verify the candidate is deleted
     get_response = client.get(f"/api/candidates/{candidate_id}", headers=auth_headers)
-    assert get_response.status_code == status.HTTP_404_NOT_FOUND 
\ No newline at end of file
+    assert get_response.status_code == status.HTTP_404_NOT_FOUND 
+
+def test_get_leaderboard_by_skill_and_location(client, auth_headers, test_candidate):
+    client.post(
+        "/api/candidates/",
+        headers=auth_headers,
+        json=test_candidate
+    )
+
+    response = client.get(
+        "/api/candidates/leaderboard",
+        headers=auth_headers,
+        params={"skill": "python", "location": "New York", "limit": 5}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert isinstance(data, list)
+    assert len(data) <= 5
+    scores = [c["score"] for c in data if c["score"] is not None]
+    assert scores == sorted(scores, reverse=True)
+
+def test_get_leaderboard_not_modified(client, auth_headers):
+    response = client.get("/api/candidates/leaderboard", headers=auth_headers, params={"limit": 5})
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["etag"]
+
+    cached = client.get(
+        "/api/candidates/leaderboard",
+        headers={**auth_headers, "If-None-Match": etag},
+        params={"limit": 5}
+    )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.headers["etag"] == etag
+
+def test_export_candidates_ndjson(client, auth_headers, test_candidate):
+    client.post(
+        "/api/candidates/",
+        headers=auth_headers,
+        json=test_candidate
+    )
+
+    response = client.get("/api/candidates/export", headers=auth_headers, params={"format": "ndjson"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [line for line in response.text.splitlines() if line]
+    assert len(lines) > 0
+
+def test_get_candidates_batch_preserves_order(client, auth_headers, test_candidate):
+    create_response = client.post(
+        "/api/candidates/",
+        headers=auth_headers,
+        json=test_candidate
+    )
+    candidate_id = create_response.json()["data"]["id"]
+
+    response = client.post(
+        "/api/candidates/batch",
+        headers=auth_headers,
+        json={"ids": ["00000000-0000-0000-0000-000000000000", candidate_id]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [c["id"] for c in data["data"]] == [candidate_id]
+    assert data["missing_ids"] == ["00000000-0000-0000-0000-000000000000"]
+
+def test_bulk_update_candidate_status(client, auth_headers, test_candidate):
+    create_response = client.post(
+        "/api/candidates/",
+        headers=auth_headers,
+        json=test_candidate
+    )
+    candidate_id = create_response.json()["data"]["id"]
+
+    response = client.patch(
+        "/api/candidates/bulk",
+        headers=auth_headers,
+        json={"items": [
+            {"id": candidate_id, "changes": {"status": "contacted"}},
+            {"id": "00000000-0000-0000-0000-000000000000", "changes": {}}
+        ]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["data"]["updated"] == 1
+    assert data["data"]["missing_ids"] == []
+    assert data["data"]["skipped_ids"] == ["00000000-0000-0000-0000-000000000000"]
+
+    detail = client.get(f"/api/candidates/{candidate_id}", headers=auth_headers).json()
+    assert detail["data"]["status"] == "contacted"
@@ -0,0 +1,185 @@
+import asyncio
+import socketserver
+import threading
+import time
+import pytest
+from app.services.delivery import SMTPProvider, TokenBucket, DeliveryWorker
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept mail and keep it in memory."""
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO", "MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for data_line in iter(self.rfile.readline, b".\r\n"):
+                    data.append(data_line)
+                self.server.messages.append(b"".join(data).decode())
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+@pytest.fixture
+def smtp_sink():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPSinkHandler)
+    server.daemon_threads = True
+    server.messages = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_smtp_provider_reuses_connection(smtp_sink):
+    provider = SMTPProvider(host="127.0.0.1", port=smtp_sink.server_address[1], sender="recruiter@example.com")
+    provider.send("john@example.com", "Hello", "Hello John")
+    connection = provider._connection
+    provider.send("jane@example.com", "Hello", "Hello Jane")
+    assert provider._connection is connection
+    provider.close()
+
+    assert len(smtp_sink.messages) == 2
+    assert "To: john@example.com" in smtp_sink.messages[0]
+    assert "Hello Jane" in smtp_sink.messages[1]
+
+def test_delivery_worker_sends_and_retries(smtp_sink, monkeypatch):
+    provider = SMTPProvider(host="127.0.0.1", port=smtp_sink.server_address[1])
+    worker = DeliveryWorker(provider=provider, max_attempts=2)
+    marked = {}
+    monkeypatch.setattr(worker, "_mark", lambda ids, new_status: marked.setdefault(new_status, []).extend(ids) or ids)
+
+    batch = [
+        (0, {"id": "m1", "candidate_id": "c1", "to": "john@example.com", "subject": "Hi", "body": "Hi John"}),
+        (0, {"id": "m2", "candidate_id": "c2", "to": None, "subject": "Hi", "body": "Hi"}),
+    ]
+    result = asyncio.run(worker.deliver(batch))
+    provider.close()
+
+    assert result == {"sent": 1, "failed": 1}
+    assert marked["sent"] == ["m1"]
+    assert marked["failed"] == ["m2"]
+    assert len(smtp_sink.messages) == 1
+
+class _FailingProvider:
+    name = "failing"
+
+    def __init__(self):
+        self.calls = 0
+
+    def send(self, to, subject, body):
+        self.calls += 1
+        raise ConnectionError("provider down")
+
+    def close(self):
+        pass
+
+def test_delivery_worker_backs_off_then_fails(monkeypatch):
+    provider = _FailingProvider()
+    worker = DeliveryWorker(provider=provider, max_attempts=2)
+    marked, renewed = {}, []
+    monkeypatch.setattr(worker, "_mark", lambda ids, new_status: marked.setdefault(new_status, []).extend(ids) or ids)
+    monkeypatch.setattr(worker, "_renew_lease", lambda ids: renewed.extend(ids) or ids)
+    monkeypatch.setattr("app.services.delivery.DELIVERY_BACKOFF_SECONDS", 2)
+    message = {"id": "m1", "candidate_id": "c1", "to": "john@example.com", "subject": "Hi", "body": "Hi John"}
+
+    before = time.monotonic()
+    assert asyncio.run(worker.deliver([(0, message)])) == {"sent": 0, "failed": 0}
+    due, attempt, message_id, _ = worker._retries[0]
+    assert (attempt, message_id) == (1, "m1")
+    assert before + 2 <= due <= time.monotonic() + 2
+    assert worker._due_retries() == []
+    assert renewed == ["m1"]
+
+    worker._retries = [(0, attempt, message_id, message)]
+    assert asyncio.run(worker.deliver(worker._due_retries())) == {"sent": 0, "failed": 1}
+    assert marked["failed"] == ["m1"]
+    assert worker._retries == []
+    assert provider.calls == 2
+
+def test_delivery_worker_stop_returns_claims(monkeypatch):
+    worker = DeliveryWorker(provider=_FailingProvider())
+    marked = {}
+    monkeypatch.setattr(worker, "_mark", lambda ids, new_status: marked.setdefault(new_status, []).extend(ids) or ids)
+    worker._claims = {"m1": "2024-01-01T00:00:00+00:00", "m2": "2024-01-01T00:00:01+00:00"}
+    worker._retries = [(time.monotonic() + 60, 1, "m2", {"id": "m2"})]
+
+    asyncio.run(worker.stop())
+    assert sorted(marked["pending"]) == ["m1", "m2"]
+    assert worker._claims == {} and worker._retries == []
+
+class _OutreachTable:
+    """Records update filters and changes only rows matching the worker's claim."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+
+    def table(self, name):
+        return self
+
+    def update(self, values):
+        self.values, self.matchers = values, []
+        return self
+
+    def in_(self, column, values):
+        self.matchers.append((column, "in", list(values)))
+        return self
+
+    def eq(self, column, value):
+        self.matchers.append((column, "eq", value))
+        return self
+
+    def execute(self):
+        self.filters.append(self.matchers)
+        changed = []
+        for row in self.rows:
+            if all(row[column] in value if op == "in" else row[column] == value for column, op, value in self.matchers):
+                row.update(self.values)
+                changed.append(dict(row))
+
+        class Result:
+            data = changed
+        return Result()
+
+def test_delivery_worker_only_updates_messages_it_still_holds(monkeypatch):
+    table = _OutreachTable([
+        {"id": "m1", "status": "sending", "claimed_at": "t1"},
+        # Swept back and claimed by another worker since this one claimed it at t1
+        {"id": "m2", "status": "sending", "claimed_at": "t9"},
+        {"id": "m3", "status": "sending", "claimed_at": "t2"},
+    ])
+    monkeypatch.setattr("app.services.delivery.supabase", table)
+    worker = DeliveryWorker(provider=_FailingProvider())
+    worker._claims = {"m1": "t1", "m2": "t1", "m3": "t2"}
+
+    assert worker._mark(["m1", "m2"], "sent") == ["m1"]
+    assert table.filters[0] == [("id", "in", ["m1", "m2"]), ("status", "eq", "sending"), ("claimed_at", "eq", "t1")]
+    assert [row["status"] for row in table.rows] == ["sent", "sending", "sending"]
+
+    assert worker._renew_lease(["m3"]) == ["m3"]
+    assert worker._claims["m3"] == table.rows[2]["claimed_at"] != "t2"
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    started = time.monotonic()
+    asyncio.run(take(5))
+    assert time.monotonic() - started >= 0.18
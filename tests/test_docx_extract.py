@@ -0,0 +1,38 @@
+import zipfile
+from app.services.docx_extract import extract_docx_text
+
+NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+)
+
+DOCUMENT = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document {NAMESPACES}><w:body>
+<w:p><w:r><w:t>Summary</w:t><w:tab/><w:t xml:space="preserve">line one</w:t></w:r></w:p>
+<w:p><w:r><mc:AlternateContent>
+  <mc:Choice Requires="wps"><w:txbxContent><w:p><w:r><w:t>Skills: Python, Docker</w:t></w:r></w:p></w:txbxContent></mc:Choice>
+  <mc:Fallback><w:txbxContent><w:p><w:r><w:t>Skills: Python, Docker</w:t></w:r></w:p></w:txbxContent></mc:Fallback>
+</mc:AlternateContent></w:r></w:p>
+<w:tbl>
+  <w:tr><w:tc><w:p><w:r><w:t>Tools</w:t></w:r></w:p></w:tc><w:tc><w:p><w:r><w:t>Git</w:t></w:r></w:p><w:p><w:r><w:t>Jira</w:t></w:r></w:p></w:tc></w:tr>
+</w:tbl>
+<w:p><w:r><w:t>End</w:t></w:r></w:p>
+</w:body></w:document>"""
+
+HEADER = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:hdr {NAMESPACES}><w:p><w:r><w:t>Jane Doe</w:t></w:r></w:p></w:hdr>"""
+
+def test_extract_docx_text_reads_headers_tables_and_text_boxes(tmp_path):
+    path = tmp_path / "resume.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", DOCUMENT)
+        archive.writestr("word/header1.xml", HEADER)
+
+    assert extract_docx_text(str(path)) == (
+        "Jane Doe\n"
+        "Summary\tline one\n"
+        "Skills: Python, Docker\n"
+        "\n"
+        "Tools | Git Jira\n"
+        "End\n"
+    )
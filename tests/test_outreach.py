@@ -110,4 +110,51 @@ def test_send_outreach_invalid_template(client, auth_headers, test_candidate):
         headers=auth_headers,
         json=outreach_data
     )
-    assert response.status_code == status.HTTP_404_NOT_FOUND 
\ No newline at end of file
+    assert response.status_code == status.HTTP_404_NOT_FOUND 
+
+def test_send_bulk_outreach(client, auth_headers, test_candidate, test_template):
+    candidate_response = client.post(
+        "/api/candidates/",
+        headers=auth_headers,
+        json=test_candidate
+    )
+    candidate_id = candidate_response.json()["id"]
+
+    template_response = client.post(
+        "/api/outreach/templates",
+        headers=auth_headers,
+        json=test_template
+    )
+    template_id = template_response.json()["id"]
+
+    response = client.post(
+        "/api/outreach/send-bulk",
+        headers=auth_headers,
+        json={
+            "template_id": template_id,
+            "candidate_ids": [candidate_id, "00000000-0000-0000-0000-000000000000"]
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["inserted"] == 1
+    assert data["missing_candidate_ids"] == ["00000000-0000-0000-0000-000000000000"]
+
+def test_get_templates_not_modified(client, auth_headers, test_template):
+    client.post(
+        "/api/outreach/templates",
+        headers=auth_headers,
+        json=test_template
+    )
+
+    response = client.get("/api/outreach/templates", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["etag"]
+    assert "max-age" in response.headers["cache-control"]
+
+    cached = client.get(
+        "/api/outreach/templates",
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.headers["etag"] == etag
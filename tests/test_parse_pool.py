@@ -0,0 +1,51 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from app.services.parse_pool import ParsePool
+
+def test_parse_pool_runs_jobs_and_recovers_from_timeout():
+    pool = ParsePool(workers=1, max_pending=4, timeout=2, initializer=None)
+
+    async def run():
+        assert await pool.run(pow, 2, 10) == 1024
+        with pytest.raises(HTTPException) as error:
+            await pool.run(time.sleep, 10)
+        assert error.value.status_code == 504
+        # The stuck worker was replaced, so later jobs still run
+        return await pool.run(pow, 3, 2)
+
+    try:
+        assert asyncio.run(run()) == 9
+    finally:
+        pool.shutdown()
+
+def test_parse_pool_rejects_when_full():
+    pool = ParsePool(workers=1, max_pending=1, timeout=5, initializer=None)
+
+    async def run():
+        return await asyncio.gather(pool.run(time.sleep, 0.2), pool.run(time.sleep, 0.2), return_exceptions=True)
+
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert first is None
+    assert isinstance(second, HTTPException) and second.status_code == 429
+
+def test_parse_pool_stops_jobs_their_caller_gave_up_on():
+    pool = ParsePool(workers=1, max_pending=4, timeout=60, initializer=None)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.run(time.sleep, 30, timeout=0.5), 0.1)
+        # Still counted while the worker is busy, then the worker is killed at the job's timeout
+        assert pool.pending == 1
+        await asyncio.sleep(1)
+        assert pool.pending == 0
+        return await pool.run(pow, 3, 2)
+
+    try:
+        assert asyncio.run(run()) == 9
+    finally:
+        pool.shutdown()
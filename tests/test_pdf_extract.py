@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.services import pdf_extract
+from app.services.parse_pool import ParsePool
+from benchmarks.bench_pdf_extract import write_pdf
+
+class _Page:
+    def __init__(self, orientations):
+        self.edges = [{"orientation": orientation} for orientation in orientations]
+
+def test_page_ranges_cover_every_page_once():
+    assert pdf_extract.page_ranges(10, per_job=4) == [(0, 4), (4, 8), (8, 10)]
+    assert pdf_extract.page_ranges(4, per_job=4) == [(0, 4)]
+    assert pdf_extract.page_ranges(0, per_job=4) == []
+
+def test_page_may_have_tables_needs_edges_both_ways():
+    assert pdf_extract.page_may_have_tables(_Page("hhvv"))
+    assert not pdf_extract.page_may_have_tables(_Page("hhhhv"))
+    assert not pdf_extract.page_may_have_tables(_Page(""))
+
+@pytest.mark.parametrize("engine", pdf_extract.ENGINES)
+def test_extract_pdf_text_caps_pages(tmp_path, engine):
+    path = tmp_path / "resume.pdf"
+    write_pdf(path, 6)
+
+    assert pdf_extract.count_pages(str(path), engine) == 6
+    text = pdf_extract.extract_pdf_text(str(path), engine=engine, max_pages=3)
+    assert "Page 2 line 0" in text
+    assert "Page 3 line 0" not in text
+
+@pytest.mark.parametrize("engine", pdf_extract.ENGINES)
+def test_parallel_extraction_matches_sequential(monkeypatch, tmp_path, engine):
+    path = tmp_path / "resume.pdf"
+    write_pdf(path, 12)
+    pool = ParsePool(workers=2)
+    monkeypatch.setattr(pdf_extract, "parse_pool", pool)
+    monkeypatch.setattr(pdf_extract, "PDF_PARALLEL_MIN_PAGES", 4)
+
+    jobs = []
+    run = pool.run
+
+    async def counted_run(fn, *args, **options):
+        jobs.append(args[1:3])
+        return await run(fn, *args, **options)
+
+    monkeypatch.setattr(pool, "run", counted_run)
+
+    try:
+        parallel = asyncio.run(pdf_extract.extract_pdf_text_parallel(str(path), engine=engine))
+    finally:
+        pool.shutdown()
+    assert jobs == pdf_extract.page_ranges(12)
+    assert parallel == pdf_extract.extract_pdf_text(str(path), engine=engine)
+    assert "Page 11 line 0" in parallel
+
+def test_parallel_extraction_limits_and_cancels_ranges(monkeypatch):
+    monkeypatch.setattr(pdf_extract, "count_pages", lambda file_path, engine: 40)
+    monkeypatch.setattr(pdf_extract, "PDF_PARALLEL_MIN_PAGES", 4)
+    monkeypatch.setattr(pdf_extract, "PDF_MAX_JOBS_PER_DOCUMENT", 2)
+    running, started, cancelled = [0], [], []
+
+    class _Pool:
+        async def run(self, fn, file_path, start, stop, engine, timeout=None):
+            running[0] += 1
+            started.append(start)
+            assert running[0] <= 2
+            try:
+                if start == 4:
+                    raise HTTPException(status_code=429)
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(start)
+                raise
+            finally:
+                running[0] -= 1
+
+    monkeypatch.setattr(pdf_extract, "parse_pool", _Pool())
+    with pytest.raises(HTTPException):
+        asyncio.run(pdf_extract.extract_pdf_text_parallel("resume.pdf", max_pages=40))
+    # The failure cancelled the ranges still running and the rest never reached the pool
+    assert len(started) < len(pdf_extract.page_ranges(40))
+    assert sorted(cancelled) == [start for start in started if start != 4]
@@ -0,0 +1,22 @@
+from app.services.resume_cache import ResumeCache
+
+def test_resume_cache_round_trip(tmp_path):
+    cache = ResumeCache(path=str(tmp_path / "cache.sqlite3"), max_bytes=1024 * 1024)
+    assert cache.get("abc:1:p") is None
+
+    cache.put("abc:1:p", "resume text", {"full_name": "Jane Doe", "skills": ["python"]}, file_size=2048)
+    cached = cache.get("abc:1:p")
+    assert cached["text"] == "resume text"
+    assert cached["result"]["skills"] == ["python"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_resume_cache_evicts_least_recently_used(tmp_path):
+    cache = ResumeCache(path=str(tmp_path / "cache.sqlite3"), max_bytes=300)
+    cache.put("first", "x" * 100, {}, file_size=100)
+    cache.put("second", "y" * 100, {}, file_size=100)
+    cache.get("first")
+    cache.put("third", "z" * 100, {}, file_size=100)
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
@@ -0,0 +1,93 @@
+import asyncio
+from fastapi import HTTPException
+from app.services.resume_jobs import ResumeJobQueue, ResumeJobStore
+from app.services.uploads import StoredUpload
+
+def _upload(tmp_path, name="resume.pdf"):
+    path = tmp_path / "upload.tmp"
+    path.write_bytes(b"%PDF-1.4 test")
+    return StoredUpload(str(path), name, "application/pdf", 13, "abc123")
+
+def test_resume_job_reports_stages_and_result(tmp_path):
+    async def parse(upload, progress=None):
+        await progress("extract")
+        await progress("llm")
+        return {"full_name": "Jane Doe", "size": len(open(upload.path, "rb").read())}
+
+    queue = ResumeJobQueue(parse=parse, store=ResumeJobStore(str(tmp_path / "jobs.sqlite3")), workers=1, upload_dir=str(tmp_path / "uploads"))
+
+    async def run():
+        await queue.start()
+        with _upload(tmp_path) as upload:
+            job = await queue.submit(upload, "user-1")
+        events = [event async for event in queue.events(job["id"])]
+        await queue.stop()
+        return job, events, await queue.get(job["id"])
+
+    job, events, finished = asyncio.run(run())
+    assert job["status"] == "queued"
+    assert events[-1].startswith("event: succeeded\n")
+    assert finished["status"] == "succeeded" and finished["progress"] == 100
+    assert finished["result"] == {"full_name": "Jane Doe", "size": 13}
+    assert not (tmp_path / "uploads").exists() or not any((tmp_path / "uploads").iterdir())
+
+def test_expired_jobs_are_requeued_on_start(tmp_path):
+    store = ResumeJobStore(str(tmp_path / "jobs.sqlite3"))
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir()
+    for job_id in ("job-1", "job-2"):
+        (upload_dir / f"{job_id}.pdf").write_bytes(b"%PDF")
+        store.create(job_id, "user-1", f"{job_id}.pdf", str(upload_dir / f"{job_id}.pdf"), 4, "abc")
+    # job-1's process died with its lease run out; job-2's owner is alive and renewing
+    assert store.claim("job-1", "dead-process", lease_seconds=-1)
+    assert store.claim("job-2", "live-process", lease_seconds=60)
+    parsed = []
+
+    async def parse(upload, progress=None):
+        parsed.append(upload.filename)
+        return {"full_name": "Jane Doe"}
+
+    queue = ResumeJobQueue(parse=parse, store=store, workers=1, upload_dir=str(upload_dir))
+
+    async def run():
+        await queue.start()
+        await queue._get_queue().join()
+        await queue.stop()
+
+    asyncio.run(run())
+    job = store.get("job-1")
+    assert parsed == ["job-1.pdf"]
+    assert job["status"] == "succeeded" and job["attempts"] == 2
+    assert store.get("job-2")["status"] == "running"
+
+def test_exhausted_and_old_jobs_are_removed(tmp_path):
+    store = ResumeJobStore(str(tmp_path / "jobs.sqlite3"))
+    for job_id in ("crashy", "done"):
+        (tmp_path / f"{job_id}.pdf").write_bytes(b"%PDF")
+        store.create(job_id, "user-1", f"{job_id}.pdf", str(tmp_path / f"{job_id}.pdf"), 4, "abc")
+    assert store.claim("crashy", "dead-process", lease_seconds=-1)
+    store.update("done", status="succeeded", result={"full_name": "Jane Doe"})
+    queue = ResumeJobQueue(store=store, upload_dir=str(tmp_path), retention_seconds=-1)
+
+    requeued, failed = store.requeue_expired(max_attempts=1)
+    assert requeued == [] and [job["id"] for job in failed] == ["crashy"]
+    assert store.get("crashy")["error"] == "Too many attempts"
+
+    asyncio.run(queue.maintain())
+    assert store.get("crashy") is None and store.get("done") is None
+    assert not (tmp_path / "crashy.pdf").exists() and not (tmp_path / "done.pdf").exists()
+
+def test_concurrent_submits_respect_queue_size(tmp_path):
+    queue = ResumeJobQueue(store=ResumeJobStore(str(tmp_path / "jobs.sqlite3")), max_queued=1, upload_dir=str(tmp_path / "uploads"))
+    uploads = []
+    for index in range(3):
+        path = tmp_path / f"upload-{index}.tmp"
+        path.write_bytes(b"%PDF-1.4 test")
+        uploads.append(StoredUpload(str(path), "resume.pdf", "application/pdf", 13, "abc123"))
+
+    async def run():
+        return await asyncio.gather(*(queue.submit(upload, "user-1") for upload in uploads), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert sum(isinstance(result, HTTPException) and result.status_code == 429 for result in results) == 2
+    assert queue._get_queue().qsize() == 1
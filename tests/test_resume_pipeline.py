@@ -0,0 +1,135 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from app.services import resume_parser
+from app.services.resume_cache import ResumeCache
+import zipfile
+from app.services import resume_pipeline
+from app.services.parse_pool import ParsePool
+from app.services.resume_pipeline import ResumePipeline
+from app.services.uploads import StoredUpload
+
+PARAGRAPHS = [
+    "Jane Doe", "jane.doe@example.com | 555-123-4567",
+    "Experience", "Senior Engineer, Acme Corp (2019 - 2024)",
+    "Skills", "Python, Docker"
+]
+
+def _docx(tmp_path, paragraphs=PARAGRAPHS):
+    path = tmp_path / "resume.docx"
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>{body}</w:body></w:document>'
+        )
+    return StoredUpload(str(path), "resume.docx", None, path.stat().st_size, "abc")
+
+def _hang(text, contact):
+    time.sleep(30)
+
+def _run(monkeypatch, tmp_path, enrich, **pipeline_options):
+    pool = ParsePool(workers=1, initializer=None)
+    monkeypatch.setattr(resume_pipeline, "parse_pool", pool)
+    monkeypatch.setattr(resume_pipeline, "enrich_with_llm", enrich)
+    stages = []
+
+    async def progress(stage):
+        stages.append(stage)
+
+    try:
+        pipeline = ResumePipeline(skip=("entities",), **pipeline_options)
+        return asyncio.run(pipeline.run(_docx(tmp_path), progress=progress)), stages
+    finally:
+        pool.shutdown()
+
+def test_pipeline_merges_llm_fields_with_local_contact(monkeypatch, tmp_path):
+    seen = {}
+
+    async def enrich(text, sections):
+        seen["sections"] = sections
+        return {"full_name": "Jane Doe", "experience": [{"company": "Acme Corp"}], "years_of_experience": 5}
+
+    document, stages = _run(monkeypatch, tmp_path, enrich)
+    assert stages == ["extract", "segment", "llm", "normalize"]
+    assert document.skipped == ["entities"] and document.degraded == []
+    assert "Acme Corp" in seen["sections"]["experience"]
+    assert document.result["email"] == "jane.doe@example.com"
+    assert document.result["phone"] == "555-123-4567"
+    assert document.result["experience"] == [{"company": "Acme Corp"}]
+    assert set(document.timings) == {"extract", "segment", "llm", "normalize"}
+
+def test_pipeline_degrades_when_llm_misses_its_deadline(monkeypatch, tmp_path):
+    async def enrich(text, sections):
+        await asyncio.sleep(5)
+
+    document, _ = _run(monkeypatch, tmp_path, enrich, deadlines={"llm": 0.05})
+    assert document.degraded == ["llm"] and document.llm is None
+    assert document.result["full_name"] == "Jane Doe"
+    assert document.result["email"] == "jane.doe@example.com"
+
+def test_parse_resume_fails_when_llm_degrades(monkeypatch, tmp_path):
+    async def enrich(text, sections):
+        raise RuntimeError("LLM unavailable")
+
+    pool = ParsePool(workers=1, initializer=None)
+    monkeypatch.setattr(resume_pipeline, "parse_pool", pool)
+    monkeypatch.setattr(resume_pipeline, "enrich_with_llm", enrich)
+    monkeypatch.setattr(resume_pipeline, "resume_pipeline", ResumePipeline(skip=("entities",)))
+    monkeypatch.setattr(resume_parser, "resume_cache", ResumeCache(str(tmp_path / "cache.sqlite3")))
+
+    try:
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(resume_parser.parse_resume(_docx(tmp_path)))
+    finally:
+        pool.shutdown()
+    assert error.value.status_code == 503
+
+def test_pipeline_without_llm_leaves_experience_empty(monkeypatch, tmp_path):
+    pool = ParsePool(workers=1, initializer=None)
+    monkeypatch.setattr(resume_pipeline, "parse_pool", pool)
+
+    try:
+        document = asyncio.run(ResumePipeline(skip=("llm",)).run(_docx(tmp_path)))
+    finally:
+        pool.shutdown()
+    # The heuristics found "Senior Engineer", but as a snippet, not a ResumeData experience entry
+    assert document.entities["experience"]
+    assert document.result["experience"] == [] and document.result["education"] is None
+    assert document.result["skills"] and document.result["email"] == "jane.doe@example.com"
+
+def test_pipeline_reports_skill_display_names(monkeypatch, tmp_path):
+    pool = ParsePool(workers=1, initializer=None)
+    monkeypatch.setattr(resume_pipeline, "parse_pool", pool)
+    paragraphs = PARAGRAPHS[:-1] + ["Python, SQL, Spark, Hadoop, Big Data, Data Science, AI, Machine Learning, scikit-learn, Node.js"]
+
+    try:
+        document = asyncio.run(ResumePipeline(skip=("llm",)).run(_docx(tmp_path, paragraphs)))
+    finally:
+        pool.shutdown()
+    assert document.result["skills"] == [
+        "python", "javascript", "node.js", "sql", "machine learning", "scikit-learn",
+        "data science", "ai", "big data", "spark", "hadoop"
+    ]
+
+def test_pipeline_kills_a_pool_job_that_outlives_its_stage(monkeypatch, tmp_path):
+    pool = ParsePool(workers=1, initializer=None)
+    monkeypatch.setattr(resume_pipeline, "parse_pool", pool)
+    monkeypatch.setattr(resume_pipeline, "heuristic_entities", _hang)
+
+    async def run():
+        pipeline = ResumePipeline(skip=("llm",), deadlines={"extract": 30, "entities": 0.5})
+        document = await pipeline.run(_docx(tmp_path))
+        # The hung worker is stopped at the stage deadline, so the pool is free again
+        await asyncio.sleep(0.5)
+        return document, pool.pending, await pool.run(pow, 3, 2)
+
+    try:
+        document, pending, result = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert document.degraded == ["entities"]
+    assert document.result["email"] == "jane.doe@example.com"
+    assert pending == 0 and result == 9
+    assert document.timings["entities"] >= 0.5
@@ -0,0 +1,50 @@
+from app.services.resume_sections import segment_sections, extract_contact, build_llm_input, estimate_tokens
+
+RESUME = """Jane Doe
+jane.doe@example.com | 555-123-4567
+
+Professional Summary
+Backend engineer with 6 years of experience.
+
+WORK EXPERIENCE:
+Acme Corp - Senior Engineer (2019 - 2024)
+Built payment services in Python.
+
+Education
+BSc Computer Science, State University, 2018
+
+Technical Skills
+Python, Docker, Kubernetes
+
+Projects
+Open-source contributor.
+"""
+
+def test_segment_sections_and_contact():
+    sections = segment_sections(RESUME)
+    assert sections["contact"].startswith("Jane Doe")
+    assert sections["summary"] == "Backend engineer with 6 years of experience."
+    assert "Acme Corp" in sections["experience"]
+    assert "State University" in sections["education"]
+    assert sections["skills"] == "Python, Docker, Kubernetes"
+    assert sections["other"] == "Open-source contributor."
+
+    assert extract_contact(RESUME) == {"email": "jane.doe@example.com", "phone": "555-123-4567"}
+
+def test_build_llm_input_drops_skills_and_respects_budget():
+    sections = segment_sections(RESUME)
+    llm_text, truncated = build_llm_input(RESUME, sections, budget=1000)
+    assert not truncated
+    assert "Acme Corp" in llm_text and "Kubernetes" not in llm_text and "Open-source" not in llm_text
+
+    sections["experience"] = "\n".join(f"Bullet {i}: shipped a feature" for i in range(500))
+    llm_text, truncated = build_llm_input(RESUME, sections, budget=200)
+    assert truncated
+    assert estimate_tokens(llm_text) <= 200 + 2
+    assert llm_text.startswith("Jane Doe")
+
+def test_build_llm_input_without_headings_truncates_full_text():
+    text = "\n".join(f"line {i} of an unstructured resume" for i in range(400))
+    llm_text, truncated = build_llm_input(text, segment_sections(text), budget=100)
+    assert truncated
+    assert text.startswith(llm_text) and len(llm_text) <= 400
@@ -0,0 +1,19 @@
+from app.services.skill_matcher import AhoCorasick, skill_matcher
+
+def test_automaton_reports_overlapping_matches():
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+    matches = [(start, end, automaton.patterns[index]) for start, end, index in automaton.iter_matches("ushers")]
+    assert matches == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+def test_skills_need_whole_words_and_positive_context():
+    found = skill_matcher.match("Skills: Python, Docker and Kubernetes.\n" + "x" * 80 + " go home " + "y" * 80)
+    assert found["programming"] == ["python"]
+    assert found["cloud"] == ["kubernetes", "docker"]
+    assert found["tools"] == []
+
+def test_skill_order_and_shape_follow_taxonomy():
+    found = skill_matcher.match("Built services using node.js, Postgres and pythonic ideas")
+    assert list(found) == ["programming", "frameworks", "databases", "cloud", "tools", "ai_ml", "data", "payment_gateways"]
+    assert found["programming"] == ["javascript"]
+    assert found["frameworks"] == ["node"]
+    assert found["databases"] == ["postgresql"]
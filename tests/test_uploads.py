@@ -0,0 +1,33 @@
+import asyncio
+import hashlib
+import io
+import os
+import pytest
+from fastapi import HTTPException, UploadFile
+from app.services.uploads import store_upload
+
+def test_store_upload_spools_and_hashes():
+    content = b"resume bytes " * 100000
+    upload = asyncio.run(store_upload(UploadFile(file=io.BytesIO(content), filename="Resume.PDF"), max_bytes=len(content)))
+    try:
+        assert upload.size == len(content)
+        assert upload.sha256 == hashlib.sha256(content).hexdigest()
+        assert upload.extension == ".pdf"
+        with upload.open() as stored:
+            assert stored.read() == content
+    finally:
+        upload.close()
+    assert not os.path.exists(upload.path)
+
+def test_store_upload_rejects_oversized_and_empty_files(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(store_upload(UploadFile(file=io.BytesIO(b"0" * 2048), filename="large.pdf"), max_bytes=1024))
+    assert error.value.status_code == 413
+    assert "File too large" in error.value.detail
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(store_upload(UploadFile(file=io.BytesIO(b""), filename="empty.pdf")))
+    assert error.value.status_code == 400
+    # Rejected uploads leave no temp files behind
+    assert list(tmp_path.iterdir()) == []